@@ -1,36 +1,79 @@
 import os
-from pathlib import Path
+import stat
+
+# Any of the user/group/other execute bits counts as executable
+EXEC_BITS = stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH
+
+
+def scan_dir(directory: str) -> dict:
+    """Return {name: DirEntry} for one directory (empty if it is missing).
+
+    A single os.scandir() pass lets every check below reuse the cached
+    DirEntry type/stat info instead of issuing its own stat() calls.
+    """
+    try:
+        with os.scandir(directory) as it:
+            return {entry.name: entry for entry in it}
+    except (FileNotFoundError, NotADirectoryError):
+        return {}
+
+
+def is_dir_entry(entries: dict, name: str) -> bool:
+    entry = entries.get(name)
+    return entry is not None and entry.is_dir(follow_symlinks=False)
+
+
+def file_entry(entries: dict, name: str):
+    """Return the DirEntry for a regular file, or None if it does not exist."""
+    entry = entries.get(name)
+    if entry is not None and entry.is_file(follow_symlinks=False):
+        return entry
+    return None
+
+
+def print_permission_status(entries: dict, files: list) -> None:
+    for file in files:
+        entry = file_entry(entries, file)
+        if entry is None:
+            print(f"❓ {file} does not exist")
+            continue
+        mode = entry.stat(follow_symlinks=False).st_mode
+        permissions = format(stat.S_IMODE(mode) & 0o777, '03o')
+        if mode & EXEC_BITS:
+            print(f"✅ {file} is executable (permissions: {permissions})")
+        else:
+            print(f"❌ {file} is not executable (permissions: {permissions})")
+
 
 # This Python script will help us determine the current status of the setup
 print("Checking environment setup status...")
 
 # Check if directories exist
-project_root = Path(__file__).resolve().parent
+project_root = os.path.dirname(os.path.abspath(__file__))
+root_entries = scan_dir(project_root)
 
 required_dirs = ['datasets', 'prompts', 'tools', 'scripts']
 optional_dirs = ['output']
 
 print("\nDirectory Status:")
 for directory in required_dirs:
-    path = project_root / directory
-    if path.exists() and path.is_dir():
+    if is_dir_entry(root_entries, directory):
         print(f"✅ {directory} directory exists")
     else:
         print(f"❌ {directory} directory is missing")
 
 for directory in optional_dirs:
-    path = project_root / directory
-    if path.exists() and path.is_dir():
+    if is_dir_entry(root_entries, directory):
         print(f"ℹ️ {directory} directory exists (optional)")
     else:
         print(f"ℹ️ {directory} directory not found (will be created on demand)")
 
 # Check if prompt template files exist
 prompt_files = ['character_voice.json', 'descriptive_prose.json', 'dialogue.json', 'narrative.json']
+prompt_entries = scan_dir(os.path.join(project_root, 'prompts'))
 print("\nPrompt Template Status:")
 for file in prompt_files:
-    path = project_root / 'prompts' / file
-    if path.exists() and path.is_file():
+    if file_entry(prompt_entries, file) is not None:
         print(f"✅ {file} exists")
     else:
         print(f"❌ {file} is missing")
@@ -38,32 +81,12 @@ for file in prompt_files:
 # Check script permissions
 script_files = ['prepare_dataset.py', 'validate_dataset.py', 'finetune_submit.py', 'generate.py']
 print("\nScript Permission Status:")
-for file in script_files:
-    path = project_root / 'scripts' / file
-    if path.exists() and path.is_file():
-        permissions = oct(path.stat().st_mode)[-3:]
-        is_executable = (permissions[-1] in ['1', '3', '5', '7'])
-        if is_executable:
-            print(f"✅ {file} is executable (permissions: {permissions})")
-        else:
-            print(f"❌ {file} is not executable (permissions: {permissions})")
-    else:
-        print(f"❓ {file} does not exist")
+print_permission_status(scan_dir(os.path.join(project_root, 'scripts')), script_files)
 
 # Check tools permissions
 tool_files = ['api_key_manager.py']
 print("\nTool Permission Status:")
-for file in tool_files:
-    path = project_root / 'tools' / file
-    if path.exists() and path.is_file():
-        permissions = oct(path.stat().st_mode)[-3:]
-        is_executable = (permissions[-1] in ['1', '3', '5', '7'])
-        if is_executable:
-            print(f"✅ {file} is executable (permissions: {permissions})")
-        else:
-            print(f"❌ {file} is not executable (permissions: {permissions})")
-    else:
-        print(f"❓ {file} does not exist")
+print_permission_status(scan_dir(os.path.join(project_root, 'tools')), tool_files)
 
 print("\nSetup Status Summary:")
 print("1. All required directories have been created")
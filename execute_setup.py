@@ -1,41 +1,53 @@
 #!/usr/bin/env python3
 import os
 import subprocess
-from pathlib import Path
+import sys
 
-project_root = Path(__file__).resolve().parent
+project_root = os.path.dirname(os.path.abspath(__file__))
 
 print("Making scripts executable...")
 
-def make_x(p: Path):
+def make_x(p: str, mode=None):
+    """Add +x to p unless all execute bits are already set.
+
+    mode may be passed in from a cached DirEntry.stat() to skip the stat call.
+    """
     try:
-        os.chmod(p, os.stat(p).st_mode | 0o111)
+        if mode is None:
+            mode = os.stat(p).st_mode
+        if mode & 0o111 == 0o111:
+            return
+        os.chmod(p, mode | 0o111)
         print(f"Made executable: {p}")
     except FileNotFoundError:
         print(f"Skip (not found): {p}")
 
 # Shell helpers
 for sh in ["master_setup.sh", "setup.sh", "cleanup.sh", "make_scripts_executable.sh", "make_tools_executable.sh"]:
-    make_x(project_root / sh)
+    make_x(os.path.join(project_root, sh))
 
 # Python scripts
-for d in [project_root / "scripts", project_root / "tools"]:
-    if d.is_dir():
-        for f in d.glob("*.py"):
-            make_x(f)
+for d in [os.path.join(project_root, "scripts"), os.path.join(project_root, "tools")]:
+    try:
+        with os.scandir(d) as it:
+            for entry in it:
+                if entry.name.endswith(".py") and entry.is_file():
+                    make_x(entry.path, entry.stat().st_mode)
+    except FileNotFoundError:
+        continue
 
 # Execute the master setup script
+# Output is streamed line by line so progress shows up as it happens
 print("\nExecuting master_setup.sh...")
-try:
-    result = subprocess.run([str(project_root / 'master_setup.sh')],
-                            cwd=str(project_root),
-                            check=True,
-                            text=True,
-                            capture_output=True)
-    print(result.stdout)
-    if result.stderr:
-        print("Errors:", result.stderr)
-except subprocess.CalledProcessError as e:
-    print(f"Error executing master_setup.sh: {e}")
-    print(f"Output: {e.stdout}")
-    print(f"Error: {e.stderr}")
+with subprocess.Popen([os.path.join(project_root, 'master_setup.sh')],
+                      cwd=project_root,
+                      stdout=subprocess.PIPE,
+                      stderr=subprocess.STDOUT,
+                      text=True,
+                      bufsize=1) as proc:
+    assert proc.stdout is not None
+    for line in proc.stdout:
+        sys.stdout.write(line)
+
+if proc.returncode != 0:
+    print(f"Error executing master_setup.sh: exit status {proc.returncode}")
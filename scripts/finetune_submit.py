@@ -32,11 +32,42 @@ Quick usage examples:
 import os
 import json
 import time
+import random
 import argparse
-from typing import Dict, Any, List, Optional
-from openai import OpenAI
-from tenacity import retry, wait_random_exponential, stop_after_attempt
-from dotenv import load_dotenv
+import functools
+import itertools
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Dict, Any, Iterator, Optional
+
+# openai and dotenv are imported lazily (inside the helpers below) so that
+# --help and argument errors don't pay their import time.
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+try:
+    import orjson  # Optional: much faster JSON encoder (pip install orjson)
+except ImportError:  # Fall back to the standard library json module
+    orjson = None
+
+# Files bigger than one part go through the multipart Uploads API: parts are sent
+# in parallel and a failed part is retried on its own instead of re-sending the file.
+UPLOAD_PART_SIZE = 16 * 1024 * 1024  # 16 MB (the API allows up to 64 MB per part)
+UPLOAD_PARALLEL_PARTS = 4
+
+
+@functools.lru_cache(maxsize=1)
+def _load_env() -> None:
+    """Load .env once per process (load_dotenv searches parent folders each call)."""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+@functools.lru_cache(maxsize=4)
+def _get_client(api_key: str) -> "OpenAI":
+    """Return a shared OpenAI client per API key so its connection pool is reused."""
+    from openai import OpenAI
+    return OpenAI(api_key=api_key)
+
 
 class FineTuningManager:
     def __init__(self, api_key: Optional[str] = None):
@@ -49,8 +80,8 @@ class FineTuningManager:
         - The API key is read from your .env via python-dotenv if not provided.
         - Keep your key private. Never paste it into code that will be shared.
         """
-        # Load environment variables from .env file
-        load_dotenv()
+        # Load environment variables from .env file (only the first time)
+        _load_env()
         
         # Use provided API key or get from environment
         if api_key is None:
@@ -58,27 +89,109 @@ class FineTuningManager:
             if not api_key:
                 raise ValueError("OPENAI_API_KEY not found in environment variables. Please check your .env file.")
         
-        self.client = OpenAI(api_key=api_key)
+        self.client = _get_client(api_key)
         
-    @retry(wait=wait_random_exponential(min=1, max=20), stop=stop_after_attempt(6))
-    def upload_file(self, file_path: str, purpose: str = "fine-tune") -> str:
+    def upload_file(self, file_path: str, purpose: str = "fine-tune", max_attempts: int = 6) -> str:
         """Upload a file to OpenAI with retries.
 
         Args:
             file_path (str): Path to the file to upload
             purpose (str): Purpose of the file
+            max_attempts (int): How many times to try before giving up
 
         Returns:
             str: ID of the uploaded file
 
         Tip: Use this to upload both training and validation JSONL files.
+
+        API errors (rate limits, timeouts, server hiccups) are retried with
+        randomized exponential backoff capped at 20 seconds. Files larger than
+        UPLOAD_PART_SIZE are sent in parts (see _upload_in_parts).
         """
         print(f"Uploading {file_path} to OpenAI...")
-        with open(file_path, "rb") as file:
-            # purpose must be one of the allowed literals (e.g., "fine-tune")
-            response = self.client.files.create(file=file, purpose="fine-tune")
-        print(f"File uploaded with ID: {response.id}")
-        return response.id
+        size = os.path.getsize(file_path)
+        if size > UPLOAD_PART_SIZE:
+            file_id = self._upload_in_parts(file_path, size, max_attempts)
+        else:
+            def send():
+                # Pass the open handle (not file.read() or a Path): the SDK hands file
+                # objects to httpx, which streams the multipart body in chunks, so
+                # large datasets are never held in memory in full.
+                with open(file_path, "rb") as file:
+                    # purpose must be one of the allowed literals (e.g., "fine-tune")
+                    return self.client.files.create(file=file, purpose="fine-tune")
+            file_id = self._retry(send, "Upload", max_attempts).id
+        print(f"File uploaded with ID: {file_id}")
+        return file_id
+
+    def _upload_in_parts(self, file_path: str, size: int, max_attempts: int) -> str:
+        """Upload a large file in parts through the Uploads API.
+
+        Parts are sent UPLOAD_PARALLEL_PARTS at a time and each one is retried on
+        its own, so a dropped connection costs one part rather than the whole file.
+        If a part still fails, parts that have not started are dropped and the
+        upload is cancelled.
+
+        Returns:
+            str: ID of the assembled file
+        """
+        from openai import APIError
+
+        upload = self._retry(
+            lambda: self.client.uploads.create(bytes=size, filename=os.path.basename(file_path),
+                                               mime_type="text/jsonl", purpose="fine-tune"),
+            "Starting upload", max_attempts)
+
+        def send_part(offset: int) -> str:
+            with open(file_path, "rb") as file:
+                file.seek(offset)
+                data = file.read(UPLOAD_PART_SIZE)
+            part = self._retry(lambda: self.client.uploads.parts.create(upload.id, data=data),
+                               f"Part at byte {offset}", max_attempts)
+            return part.id
+
+        pool = ThreadPoolExecutor(max_workers=UPLOAD_PARALLEL_PARTS)
+        try:
+            futures = [pool.submit(send_part, offset) for offset in range(0, size, UPLOAD_PART_SIZE)]
+            # Stop at the first part that fails for good instead of sending the rest for nothing
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            failed = next((future for future in done if future.exception() is not None), None)
+            if failed is not None:
+                failed.result()  # Re-raises that part's error
+            # Part IDs are listed in file order, which is how the API joins them
+            part_ids = [future.result() for future in futures]
+            print(f"Sent {len(part_ids)} parts; finishing upload...")
+            completed = self._retry(lambda: self.client.uploads.complete(upload.id, part_ids=part_ids),
+                                    "Finishing upload", max_attempts)
+        except BaseException:  # Includes Ctrl-C
+            pool.shutdown(wait=False, cancel_futures=True)
+            try:
+                self.client.uploads.cancel(upload.id)  # Don't leave a half-finished upload behind
+            except APIError as e:
+                print(f"Could not cancel upload {upload.id} ({e.__class__.__name__}); it will expire on its own")
+            raise  # The original failure, not the cancel error
+        pool.shutdown()
+        return completed.file.id
+
+    def _retry(self, action, what: str, max_attempts: int):
+        """Run action(), retrying API errors with randomized exponential backoff.
+
+        Args:
+            action: Zero-argument function that makes one API call
+            what (str): Short description used in the retry message
+            max_attempts (int): How many times to try before giving up
+        """
+        from openai import APIError
+
+        for attempt in range(max_attempts):
+            try:
+                return action()
+            except APIError as e:
+                if attempt == max_attempts - 1:
+                    raise
+                delay = random.uniform(1, min(2 ** attempt, 20))
+                print(f"{what} failed ({e.__class__.__name__}); retrying in {delay:.1f} seconds...")
+                time.sleep(delay)
     
     def submit_fine_tuning_job(self, 
                              training_file_id: str, 
@@ -147,37 +260,49 @@ class FineTuningManager:
             "error": job.error,
         }
     
-    def list_jobs(self, limit: int = 10) -> List[Dict[str, Any]]:
+    def list_jobs(self, limit: int = 10) -> Iterator[Dict[str, Any]]:
         """List fine-tuning jobs.
 
         Args:
-            limit (int): Maximum number of jobs to list
+            limit (int): Page size to request from the API
 
         Returns:
-            List[Dict[str, Any]]: List of job information
+            Iterator[Dict[str, Any]]: Job information, newest first
+
+        The SDK cursor fetches further pages on demand, so wrap the result in
+        itertools.islice() to stop after a fixed number of jobs.
         """
         jobs = self.client.fine_tuning.jobs.list(limit=limit)
-        return [{
+        return ({
             "id": job.id,
             "status": job.status,
             "created_at": job.created_at,
             "model": job.model,
             "fine_tuned_model": job.fine_tuned_model,
-        } for job in jobs.data]
+        } for job in jobs)
     
-    def monitor_job(self, job_id: str, interval: int = 60, max_time: int = 7200) -> Dict[str, Any]:
+    def monitor_job(self, job_id: str, interval: int = 60, max_time: int = 7200,
+                    max_interval: int = 600) -> Dict[str, Any]:
         """Monitor a fine-tuning job until completion.
 
         Args:
             job_id (str): ID of the fine-tuning job
-            interval (int): Check interval in seconds
+            interval (int): Initial check interval in seconds
             max_time (int): Maximum monitoring time in seconds
+            max_interval (int): Upper bound for the check interval in seconds
 
         Returns:
             Dict[str, Any]: Final job status
+
+        Polling backs off: while the status stays the same the wait doubles
+        (with a little random jitter) up to max_interval, and it drops back to
+        interval whenever the status changes. Long queued/running phases then
+        cost a handful of API calls instead of one per minute.
         """
         print(f"Monitoring fine-tuning job {job_id}...")
         start_time = time.time()
+        delay = interval
+        last_status = None
         
         while True:
             job_status = self.get_job_status(job_id)
@@ -197,18 +322,26 @@ class FineTuningManager:
             if elapsed_time > max_time:
                 print(f"Reached maximum monitoring time ({max_time} seconds)")
                 return job_status
-                
-            print(f"Next check in {interval} seconds...")
-            time.sleep(interval)
+
+            if last_status is not None and status == last_status:
+                delay = min(delay * 2, max_interval)
+            else:
+                delay = interval
+            last_status = status
+
+            # Jitter avoids many monitors polling in lockstep; never sleep past max_time
+            sleep_for = min(delay + random.uniform(0, delay * 0.1), max(max_time - elapsed_time, 0) + 1)
+            print(f"Next check in {sleep_for:.0f} seconds...")
+            time.sleep(sleep_for)
     
-    def list_models(self) -> List[Dict[str, Any]]:
+    def list_models(self) -> Iterator[Dict[str, Any]]:
         """List available models.
 
         Returns:
-            List[Dict[str, Any]]: List of model information
+            Iterator[Dict[str, Any]]: Model information
         """
         models = self.client.models.list()
-        return [{"id": model.id, "created": model.created} for model in models.data]
+        return ({"id": model.id, "created": model.created} for model in models)
     
     def delete_model(self, model_id: str) -> bool:
         """Delete a fine-tuned model.
@@ -250,8 +383,12 @@ class FineTuningManager:
         
         job_status["events"] = events
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(job_status, f, indent=2)
+        if orjson is not None:
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(job_status, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(job_status, f, indent=2)
             
         print(f"Job details saved to {output_file}")
 
@@ -287,8 +424,9 @@ def main():
     # Monitor job command
     monitor_parser = subparsers.add_parser("monitor", help="Monitor a fine-tuning job until completion")
     monitor_parser.add_argument("job_id", help="ID of the fine-tuning job")
-    monitor_parser.add_argument("--interval", type=int, default=60, help="Check interval in seconds")
+    monitor_parser.add_argument("--interval", type=int, default=60, help="Initial check interval in seconds")
     monitor_parser.add_argument("--max-time", type=int, default=7200, help="Maximum monitoring time in seconds")
+    monitor_parser.add_argument("--max-interval", type=int, default=600, help="Longest wait between checks in seconds")
     
     # List models command
     list_models_parser = subparsers.add_parser("list-models", help="List available models")
@@ -305,7 +443,11 @@ def main():
     # Parse arguments
     args = parser.parse_args()
     
-    # Initialize fine-tuning manager
+    if args.command is None:
+        parser.print_help()
+        return
+
+    # Initialize fine-tuning manager (imports openai/dotenv on first use)
     manager = FineTuningManager()
     
     # Execute command
@@ -337,15 +479,15 @@ def main():
         print(json.dumps(job_status, indent=2))
         
     elif args.command == "list-jobs":
-        jobs = manager.list_jobs(args.limit)
+        jobs = list(itertools.islice(manager.list_jobs(args.limit), args.limit))
         print(json.dumps(jobs, indent=2))
         
     elif args.command == "monitor":
-        final_status = manager.monitor_job(args.job_id, args.interval, args.max_time)
+        final_status = manager.monitor_job(args.job_id, args.interval, args.max_time, args.max_interval)
         print(json.dumps(final_status, indent=2))
         
     elif args.command == "list-models":
-        models = manager.list_models()
+        models = list(manager.list_models())
         print(json.dumps(models, indent=2))
         
     elif args.command == "delete-model":
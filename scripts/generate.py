@@ -14,20 +14,103 @@ Adult learner notes:
 """
 
 import os
+import re
+import sys
 import json
+import time
+import asyncio
+import string
+import hashlib
+import functools
 import argparse
-from typing import Dict, Any, List, Optional
-from openai import OpenAI
-from tenacity import retry, wait_random_exponential, stop_after_attempt
+from typing import Callable, Dict, Any, FrozenSet, Iterator, List, Optional, Tuple, Union
+from openai import OpenAI, AsyncOpenAI
+from tenacity import AsyncRetrying, RetryCallState, retry, wait_random_exponential, stop_after_attempt
 from dotenv import load_dotenv
 
+try:
+    import orjson  # Optional: much faster JSON parsing/encoding (pip install orjson)
+except ImportError:  # Fall back to the standard library json module
+    orjson = None
+
+# Sampling settings shared by every generation call.
+# Templates may override MAX_TOKENS with their own "max_tokens" field.
+TEMPERATURE = 0.7
+MAX_TOKENS = 500
+
+
+def _announce_retry(retry_state: RetryCallState) -> None:
+    """Tell the user a request is being retried instead of sitting silent.
+
+    Goes to stderr so it never mixes into results printed on stdout
+    (e.g. `generate.py batch ... > results.jsonl`).
+    """
+    error = retry_state.outcome.exception() if retry_state.outcome else None
+    wait = retry_state.next_action.sleep if retry_state.next_action else 0
+    print(f"\nRequest failed ({error.__class__.__name__ if error else 'error'}); "
+          f"retrying in {wait:.1f} seconds (attempt {retry_state.attempt_number + 1})...",
+          file=sys.stderr)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_template_file(template_path: str) -> Dict[str, Any]:
+    """Parse one template file (cached: each file is read at most once per run)."""
+    if orjson is not None:
+        with open(template_path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(template_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_format(fmt: str) -> Tuple[Callable[[Dict[str, Any]], str], FrozenSet[str]]:
+    """Pre-parse a str.format template into a fast render function.
+
+    Returns (render, fields): render(params) gives the same text as
+    fmt.format(**params), and fields is the set of parameter names it uses.
+    Templates using positional, attribute/index or nested fields fall back
+    to plain str.format.
+    """
+    parts = tuple(string.Formatter().parse(fmt))
+    # Keyword names only ("a" for "{a.b}" or "{a[0]}"; positional "{0}" is skipped)
+    fields = frozenset(
+        base for base in (re.split(r"[.\[]", name)[0] for _, name, _, _ in parts if name)
+        if base and not base.isdigit()
+    )
+    simple = all(
+        name is None or (name.isidentifier() and conversion is None and "{" not in spec)
+        for _, name, spec, conversion in parts
+    )
+    if not simple:
+        return (lambda params: fmt.format(**params)), fields
+
+    def render(params: Dict[str, Any]) -> str:
+        return "".join(
+            literal if name is None else literal + format(params[name], spec)
+            for literal, name, spec, _ in parts
+        )
+
+    return render, fields
+
+
+# Same policy for every API call: up to 6 attempts with jittered backoff
+RETRY_POLICY = dict(wait=wait_random_exponential(min=1, max=20), stop=stop_after_attempt(6),
+                    before_sleep=_announce_retry)
+
 class ContentGenerator:
-    def __init__(self, model_id: str, api_key: Optional[str] = None):
+    def __init__(self, model_id: str, api_key: Optional[str] = None, cache_ttl: float = 0):
         """Initialize the content generator
         
         Args:
             model_id (str): ID of the fine-tuned model
             api_key (str, optional): OpenAI API key (defaults to environment variable)
+            cache_ttl (float): Seconds to reuse a response for an identical request
+                (0 disables the cache)
+
+        The response cache is off by default: at temperature 0.7 asking twice
+        usually means you want a second, different draft. Turn it on for
+        batches or repeated smoke tests where identical prompts should not be
+        paid for twice.
         """
         # Load environment variables from .env file (if present)
         load_dotenv()
@@ -35,8 +118,12 @@ class ContentGenerator:
         # Lazy client creation: we only need the key/client when generating
         self._api_key = api_key or os.getenv('OPENAI_API_KEY')
         self.client: Optional[OpenAI] = None
+        self._async_client: Optional[AsyncOpenAI] = None
         self.model_id = model_id
-        self.templates = self._load_templates()
+        self.cache_ttl = cache_ttl
+        self._response_cache: Dict[str, Tuple[float, str]] = {}
+        self._menu_cache: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._templates_dir = self._prepare_templates_dir()
 
     def _ensure_client(self) -> None:
         """Create the OpenAI client on first use.
@@ -48,14 +135,20 @@ class ContentGenerator:
             if not self._api_key:
                 raise ValueError("OPENAI_API_KEY not found in environment variables. Please check your .env file.")
             self.client = OpenAI(api_key=self._api_key)
+
+    def _ensure_async_client(self) -> None:
+        """Create the AsyncOpenAI client on first use (batch generation only)."""
+        if self._async_client is None:
+            if not self._api_key:
+                raise ValueError("OPENAI_API_KEY not found in environment variables. Please check your .env file.")
+            self._async_client = AsyncOpenAI(api_key=self._api_key)
         
-    def _load_templates(self) -> Dict[str, Dict[str, Any]]:
-        """Load templates from the templates directory
+    def _prepare_templates_dir(self) -> str:
+        """Return the templates directory, creating default templates if missing
         
         Returns:
-            Dict[str, Dict[str, Any]]: Dictionary of templates
+            str: Path to the templates directory
         """
-        templates = {}
         templates_dir = os.path.join(os.path.dirname(__file__), "../prompts")
         
         if not os.path.exists(templates_dir):
@@ -63,15 +156,36 @@ class ContentGenerator:
             os.makedirs(templates_dir)
             self._create_default_templates(templates_dir)
             
-        for filename in os.listdir(templates_dir):
-            if filename.endswith(".json"):
-                template_path = os.path.join(templates_dir, filename)
-                with open(template_path, 'r', encoding='utf-8') as f:
-                    template = json.load(f)
-                    template_name = os.path.splitext(filename)[0]
-                    templates[template_name] = template
-                    
-        return templates
+        return templates_dir
+
+    @functools.cached_property
+    def template_names(self) -> List[str]:
+        """Names of the available templates (found without opening any file)"""
+        with os.scandir(self._templates_dir) as entries:
+            return [os.path.splitext(entry.name)[0] for entry in entries
+                    if entry.name.endswith(".json") and entry.is_file()]
+
+    def _get_template(self, template_name: str) -> Dict[str, Any]:
+        """Load a single template by name
+        
+        Args:
+            template_name (str): Name of the template
+            
+        Returns:
+            Dict[str, Any]: The parsed template
+        """
+        if template_name not in self.template_names:
+            raise ValueError(f"Template '{template_name}' not found")
+            
+        return _load_template_file(os.path.join(self._templates_dir, f"{template_name}.json"))
+
+    def preload(self) -> Dict[str, Dict[str, Any]]:
+        """Load every template up front (e.g. before a long batch run)
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Dictionary of templates
+        """
+        return {name: self._get_template(name) for name in self.template_names}
     
     def _create_default_templates(self, templates_dir: str) -> None:
         """Create default templates
@@ -150,8 +264,12 @@ class ContentGenerator:
         
         for template_name, template in default_templates.items():
             template_path = os.path.join(templates_dir, f"{template_name}.json")
-            with open(template_path, 'w', encoding='utf-8') as f:
-                json.dump(template, f, indent=2)
+            if orjson is not None:
+                with open(template_path, 'wb') as f:
+                    f.write(orjson.dumps(template, option=orjson.OPT_INDENT_2))
+            else:
+                with open(template_path, 'w', encoding='utf-8') as f:
+                    json.dump(template, f, indent=2)
                 
         print(f"Created default templates in {templates_dir}")
     
@@ -161,7 +279,7 @@ class ContentGenerator:
         Returns:
             List[str]: List of template names
         """
-        return list(self.templates.keys())
+        return list(self.template_names)
     
     def get_template_details(self, template_name: str) -> Dict[str, Any]:
         """Get details of a template
@@ -172,119 +290,442 @@ class ContentGenerator:
         Returns:
             Dict[str, Any]: Template details
         """
-        if template_name not in self.templates:
-            raise ValueError(f"Template '{template_name}' not found")
-            
-        return self.templates[template_name]
+        return self._get_template(template_name)
     
-    @retry(wait=wait_random_exponential(min=1, max=20), stop=stop_after_attempt(6))
-    def generate_content(self, template_name: str, params: Optional[Dict[str, Any]] = None) -> str:
-        """Generate content using a template.
+    def _build_messages(self, template_name: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, str]]:
+        """Fill a template and return the chat messages to send.
 
         Args:
             template_name (str): Name of the template
             params (Optional[Dict[str, Any]]): Template parameters
 
         Returns:
-            str: Generated content
+            List[Dict[str, str]]: System and user messages
         """
-        if template_name not in self.templates:
-            raise ValueError(f"Template '{template_name}' not found")
-
-        template = self.templates[template_name]
+        template = self._get_template(template_name)
 
         # Fill in template parameters
         system_prompt = template["system"]
         user_prompt = template["user"]
 
         if params:
-            system_prompt = system_prompt.format(**params)
-            user_prompt = user_prompt.format(**params)
+            render_system, system_fields = _compile_format(system_prompt)
+            render_user, user_fields = _compile_format(user_prompt)
+            missing = (system_fields | user_fields) - params.keys()
+            if missing:
+                raise ValueError(f"Missing template parameter(s): {', '.join(sorted(missing))}")
+            system_prompt = render_system(params)
+            user_prompt = render_user(params)
+
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+
+    def _max_tokens(self, template_name: str) -> int:
+        """Response length cap for a template (short templates can ask for less)."""
+        return int(self._get_template(template_name).get("max_tokens", MAX_TOKENS))
+
+    def _cache_key(self, messages: List[Dict[str, str]], max_tokens: int) -> str:
+        """Hash everything that determines a response into a cache key."""
+        payload = json.dumps({
+            "model": self.model_id,
+            "messages": messages,
+            "temperature": TEMPERATURE,
+            "max_tokens": max_tokens,
+        }, sort_keys=True)
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Return a cached response that is still within cache_ttl, if any."""
+        if self.cache_ttl <= 0:
+            return None
+        entry = self._response_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, content = entry
+        if time.time() - stored_at > self.cache_ttl:
+            del self._response_cache[key]
+            return None
+        return content
+
+    def _cache_put(self, key: str, content: str) -> None:
+        if self.cache_ttl > 0:
+            self._response_cache[key] = (time.time(), content)
+
+    def generate_content(self, template_name: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Generate content using a template.
+
+        Args:
+            template_name (str): Name of the template
+            params (Optional[Dict[str, Any]]): Template parameters
+
+        Returns:
+            str: Generated content
+
+        Template problems (unknown template, missing parameters) raise right
+        away; only the API call itself is retried.
+        """
+        messages = self._build_messages(template_name, params)
+        max_tokens = self._max_tokens(template_name)
+        cache_key = self._cache_key(messages, max_tokens)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        content = self._complete(messages, max_tokens)
+        self._cache_put(cache_key, content)
+        return content
 
-        # Generate content
+    @retry(**RETRY_POLICY)
+    def _complete(self, messages: List[Dict[str, str]], max_tokens: int) -> str:
+        """Request one completion (retried on failure) and return its text."""
         self._ensure_client()
         # Type assertion for static checkers
         assert self.client is not None
         response = self.client.chat.completions.create(
             model=self.model_id,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.7,
-            max_tokens=500
+            messages=messages,
+            temperature=TEMPERATURE,
+            max_tokens=max_tokens
+        )
+        return response.choices[0].message.content or ""
+
+    @retry(**RETRY_POLICY)
+    def _open_stream(self, messages: List[Dict[str, str]], max_tokens: int):
+        """Start a streamed completion (retried until the first response arrives)."""
+        self._ensure_client()
+        assert self.client is not None
+        return self.client.chat.completions.create(
+            model=self.model_id,
+            messages=messages,
+            temperature=TEMPERATURE,
+            max_tokens=max_tokens,
+            stream=True
         )
 
+    def generate_content_stream(self, template_name: str, params: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """Generate content using a template, yielding text as it arrives.
+
+        Args:
+            template_name (str): Name of the template
+            params (Optional[Dict[str, Any]]): Template parameters
+
+        Yields:
+            str: Pieces of the generated content
+
+        Printing each piece immediately means the first words show up after
+        a fraction of a second instead of after the whole response is done.
+        """
+        messages = self._build_messages(template_name, params)
+        max_tokens = self._max_tokens(template_name)
+        cache_key = self._cache_key(messages, max_tokens)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+        parts = []
+        for chunk in self._open_stream(messages, max_tokens):
+            if not chunk.choices:
+                continue
+            piece = chunk.choices[0].delta.content
+            if piece:
+                parts.append(piece)
+                yield piece
+
+        self._cache_put(cache_key, "".join(parts))
+
+    async def generate_content_async(self, template_name: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Async version of generate_content (same retry policy).
+
+        Args:
+            template_name (str): Name of the template
+            params (Optional[Dict[str, Any]]): Template parameters
+
+        Returns:
+            str: Generated content
+        """
+        messages = self._build_messages(template_name, params)
+        max_tokens = self._max_tokens(template_name)
+        cache_key = self._cache_key(messages, max_tokens)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        self._ensure_async_client()
+        assert self._async_client is not None
+        async for attempt in AsyncRetrying(**RETRY_POLICY):
+            with attempt:
+                response = await self._async_client.chat.completions.create(
+                    model=self.model_id,
+                    messages=messages,
+                    temperature=TEMPERATURE,
+                    max_tokens=max_tokens
+                )
+
         content = response.choices[0].message.content or ""
+        self._cache_put(cache_key, content)
         return content
+
+    async def generate_many(self, jobs: List[Tuple[str, Optional[Dict[str, Any]]]],
+                            concurrency: int = 8) -> List[Union[str, BaseException]]:
+        """Generate content for several (template_name, params) jobs concurrently.
+
+        Args:
+            jobs (List[Tuple[str, Optional[Dict[str, Any]]]]): Jobs to run
+            concurrency (int): Maximum number of requests in flight at once
+
+        Returns:
+            List[Union[str, BaseException]]: One result per job, in input order.
+            A failed job yields its exception instead of stopping the batch.
+
+        Requests wait on the API, not the CPU, so overlapping them finishes a
+        batch in roughly the time of the slowest few calls instead of the sum.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _bounded(job: Tuple[str, Optional[Dict[str, Any]]]) -> str:
+            template_name, params = job
+            async with semaphore:
+                return await self.generate_content_async(template_name, params)
+
+        return await asyncio.gather(*[_bounded(job) for job in jobs], return_exceptions=True)
+
+    def _estimate_tokens(self, template_name: str, params: Optional[Dict[str, Any]]) -> int:
+        """Rough token cost of one job: prompt (~4 characters per token) + response cap."""
+        messages = self._build_messages(template_name, params)
+        prompt_chars = sum(len(message["content"]) for message in messages)
+        return prompt_chars // 4 + self._max_tokens(template_name)
+
+    async def run_parallel(self, jobs_path: str, save_path: Optional[str] = None,
+                           max_requests_per_minute: float = 500,
+                           max_tokens_per_minute: float = 200_000,
+                           max_in_flight: int = 8) -> int:
+        """Run a JSONL file of jobs while staying under API rate limits.
+
+        Args:
+            jobs_path (str): JSONL file, one {"template": ..., "params": {...}} per line
+            save_path (str, optional): JSONL file for the results (default: print)
+            max_requests_per_minute (float): Request budget (RPM)
+            max_tokens_per_minute (float): Token budget (TPM)
+            max_in_flight (int): Maximum number of requests running at once
+
+        Returns:
+            int: Number of jobs that failed
+
+        Jobs are read one line at a time and each result is written as soon as
+        it finishes, so memory stays flat however long the file is. Results
+        carry the job's line "index" because they arrive out of order. A bad
+        line (invalid JSON, not an object, unknown template) gets an "error"
+        row of its own and the rest of the batch carries on.
+
+        A job is only started when both budgets have room. The budgets refill
+        continuously at their per-minute rate, and a rate-limit error halves
+        them so the batch slows down instead of piling up more 429s.
+        """
+        from openai import RateLimitError
+        from tenacity import RetryError
+
+        loads = orjson.loads if orjson is not None else json.loads
+        dumps = (lambda row: orjson.dumps(row).decode()) if orjson is not None else json.dumps
+
+        def read_jobs() -> Iterator[Tuple[int, str]]:
+            with open(jobs_path, 'r', encoding='utf-8') as f:
+                for index, line in enumerate(f):
+                    if line.strip():
+                        yield index, line
+
+        def parse_job(line: str) -> Dict[str, Any]:
+            """Decode one jobs line, raising ValueError if it is not a usable job."""
+            row = loads(line)
+            if not isinstance(row, dict):
+                raise ValueError("job must be a JSON object")
+            if "template" not in row:
+                raise ValueError("job is missing 'template'")
+            if not isinstance(row.get("params") or {}, dict):
+                raise ValueError("'params' must be a JSON object")
+            return row
+
+        async def run_job(index: int, row: Dict[str, Any]) -> Dict[str, Any]:
+            result: Dict[str, Any] = {"index": index, "template": row.get("template"), "params": row.get("params")}
+            try:
+                result["content"] = await self.generate_content_async(row["template"], row.get("params"))
+            except Exception as e:
+                result["error"] = e
+            return result
+
+        request_capacity = max_requests_per_minute
+        token_capacity = max_tokens_per_minute
+        last_update = time.monotonic()
+        jobs = read_jobs()
+        next_job: Optional[Tuple[int, Dict[str, Any], int]] = None
+        in_flight: set = set()
+        failures = 0
+
+        out = open(save_path, 'w', encoding='utf-8') if save_path else sys.stdout
+        try:
+            while True:
+                if next_job is None and jobs is not None:
+                    job = next(jobs, None)
+                    if job is None:
+                        jobs = None
+                    else:
+                        index, line = job
+                        row = None
+                        try:
+                            row = parse_job(line)  # JSON errors are ValueErrors too
+                            cost = self._estimate_tokens(row["template"], row.get("params"))
+                        except (KeyError, TypeError, ValueError) as e:
+                            failures += 1
+                            error_row: Dict[str, Any] = {"index": index, "error": str(e)}
+                            if row is not None:
+                                error_row.update(template=row.get("template"), params=row.get("params"))
+                            out.write(dumps(error_row) + "\n")
+                            continue
+                        next_job = (index, row, cost)
+
+                if next_job is None and not in_flight:
+                    break
+
+                # Refill both budgets for the time that has passed
+                now = time.monotonic()
+                elapsed = now - last_update
+                last_update = now
+                request_capacity = min(max_requests_per_minute,
+                                       request_capacity + max_requests_per_minute * elapsed / 60)
+                token_capacity = min(max_tokens_per_minute,
+                                     token_capacity + max_tokens_per_minute * elapsed / 60)
+
+                if (next_job is not None and len(in_flight) < max_in_flight
+                        and request_capacity >= 1
+                        and token_capacity >= min(next_job[2], max_tokens_per_minute)):
+                    index, row, cost = next_job
+                    request_capacity -= 1
+                    token_capacity -= cost
+                    in_flight.add(asyncio.create_task(run_job(index, row)))
+                    next_job = None
+                    continue
+
+                if not in_flight:
+                    await asyncio.sleep(0.05)
+                    continue
+
+                done, in_flight = await asyncio.wait(in_flight, timeout=0.05,
+                                                     return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    error = result.get("error")
+                    if error is not None:
+                        failures += 1
+                        cause = error.last_attempt.exception() if isinstance(error, RetryError) else error
+                        if isinstance(cause, RateLimitError):
+                            request_capacity /= 2
+                            token_capacity /= 2
+                        result["error"] = str(cause)
+                    out.write(dumps(result) + "\n")
+                out.flush()
+        finally:
+            # On an unexpected error (or Ctrl-C) stop any requests still running
+            # before the output file is closed underneath them
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+            if save_path:
+                out.close()
+
+        return failures
     
-    def fill_template_params(self, template_name: str) -> Dict[str, Any]:
-        """Interactively fill template parameters
+    def _menus(self, template_name: str) -> Dict[str, Dict[str, Any]]:
+        """Build (once per template) the menus shown by fill_template_params
         
         Args:
             template_name (str): Name of the template
             
         Returns:
-            Dict[str, Any]: Filled parameters
+            Dict[str, Dict[str, Any]]: Per-parameter menu text, options and kind
         """
-        if template_name not in self.templates:
-            raise ValueError(f"Template '{template_name}' not found")
-            
-        template = self.templates[template_name]
-        
-        if "parameters" not in template:
-            return {}
-            
-        params = {}
-        template_params = template["parameters"]
-        
+        menus = self._menu_cache.get(template_name)
+        if menus is not None:
+            return menus
+
+        template = self._get_template(template_name)
+        template_params = template.get("parameters", {})
+        menus = {}
+
         for param_name, param_values in template_params.items():
             if isinstance(param_values, list):
                 # Parameter has a list of possible values
-                print(f"\n{param_name}:")
-                for i, value in enumerate(param_values):
-                    print(f"  {i+1}. {value}")
-                    
-                choice = input(f"Choose {param_name} (1-{len(param_values)}, or enter custom): ")
-                
-                try:
-                    choice_idx = int(choice) - 1
-                    if 0 <= choice_idx < len(param_values):
-                        params[param_name] = param_values[choice_idx]
-                    else:
-                        params[param_name] = choice
-                except ValueError:
-                    params[param_name] = choice
-                    
+                options = tuple(param_values)
+                menu = {"kind": "list", "options": options}
             elif isinstance(param_values, dict):
-                # Parameter has dependent values
-                print(f"\n{param_name}:")
-                options = list(param_values.keys())
-                for i, value in enumerate(options):
-                    print(f"  {i+1}. {value}")
-                    
-                choice = input(f"Choose {param_name} (1-{len(options)}, or enter custom): ")
-                
-                try:
-                    choice_idx = int(choice) - 1
-                    if 0 <= choice_idx < len(options):
-                        chosen_key = options[choice_idx]
-                        params[param_name] = chosen_key
-                        
-                        # Set dependent value if available
-                        dependent_value = param_values[chosen_key]
-                        dependent_param = next((p for p in template["system"].split("{") if "}" in p and param_name not in p), None)
-                        
-                        if dependent_param:
-                            dependent_name = dependent_param.split("}")[0]
-                            params[dependent_name] = dependent_value
-                    else:
-                        params[param_name] = choice
-                except ValueError:
-                    params[param_name] = choice
+                # Parameter has dependent values, looked up by another parameter's
+                # choice (e.g. traits by character). Find that parameter once: the
+                # list parameter whose values are this dict's keys.
+                options = tuple(param_values.keys())
+                key_param = next((name for name, values in template_params.items()
+                                  if name != param_name and isinstance(values, list)
+                                  and set(options) <= set(values)), None)
+                menu = {"kind": "dict", "options": options, "values": param_values, "key_param": key_param}
             else:
                 # Simple parameter
-                params[param_name] = input(f"{param_name}: ")
+                menus[param_name] = {"kind": "scalar", "prompt": f"{param_name}: "}
+                continue
+
+            lines = [f"\n{param_name}:\n"]
+            lines.extend(f"  {i+1}. {value}\n" for i, value in enumerate(options))
+            menu["text"] = "".join(lines)
+            menu["prompt"] = f"Choose {param_name} (1-{len(options)}, or enter custom): "
+            menus[param_name] = menu
+
+        self._menu_cache[template_name] = menus
+        return menus
+
+    def fill_template_params(self, template_name: str) -> Dict[str, Any]:
+        """Interactively fill template parameters
+        
+        Args:
+            template_name (str): Name of the template
+            
+        Returns:
+            Dict[str, Any]: Filled parameters
+        """
+        params = {}
+
+        for param_name, menu in self._menus(template_name).items():
+            kind = menu["kind"]
+            if kind == "scalar":
+                params[param_name] = input(menu["prompt"])
+                continue
+
+            if kind == "dict":
+                key_param = menu["key_param"]
+                chosen = params.get(key_param)
+                if chosen in menu["values"]:
+                    # Already determined by an earlier choice; no need to ask
+                    params[param_name] = menu["values"][chosen]
+                    print(f"\n{param_name}: {params[param_name]} (from {key_param})")
+                    continue
+
+            sys.stdout.write(menu["text"])
+            choice = input(menu["prompt"])
+            options = menu["options"]
+
+            try:
+                choice_idx = int(choice) - 1
+            except ValueError:
+                choice_idx = -1
+
+            if not 0 <= choice_idx < len(options):
+                params[param_name] = choice
+            elif kind == "list":
+                params[param_name] = options[choice_idx]
+            else:
+                chosen_key = options[choice_idx]
+                params[param_name] = menu["values"][chosen_key]
+                if menu["key_param"] and menu["key_param"] not in params:
+                    params[menu["key_param"]] = chosen_key
                 
         return params
     
@@ -305,15 +746,10 @@ class ContentGenerator:
                 for template in templates:
                     print(f"  - {template}")
                     
-            elif command in self.templates:
+            elif command in self.template_names:
                 try:
                     params = self.fill_template_params(command)
-                    content = self.generate_content(command, params)
-                    
-                    print("\nGenerated content:")
-                    print("=" * 50)
-                    print(content)
-                    print("=" * 50)
+                    content = print_stream(self.generate_content_stream(command, params))
                     
                     save = input("Save to file? (y/n): ").strip().lower()
                     if save == "y":
@@ -338,6 +774,20 @@ class ContentGenerator:
                 print("Type 'exit' to quit, 'templates' to list available templates")
 
 
+def print_stream(pieces: Iterator[str]) -> str:
+    """Print streamed content as it arrives and return the full text."""
+    print("\nGenerated content:")
+    print("=" * 50)
+    parts = []
+    for piece in pieces:
+        sys.stdout.write(piece)
+        sys.stdout.flush()
+        parts.append(piece)
+    print()
+    print("=" * 50)
+    return "".join(parts)
+
+
 def main():
     """Main function for content generation"""
     parser = argparse.ArgumentParser(description="Generate content using fine-tuned models")
@@ -354,11 +804,27 @@ def main():
     generate_parser = subparsers.add_parser("generate", help="Generate content using a template")
     generate_parser.add_argument("template_name", help="Name of the template")
     generate_parser.add_argument("--model", required=True, help="ID of the fine-tuned model")
+    generate_parser.add_argument("--cache-ttl", type=float, default=0,
+                                 help="Reuse identical responses for this many seconds (0 = off)")
     generate_parser.add_argument("--output", help="Path to the output file")
     
     # Interactive content generation command
     interactive_parser = subparsers.add_parser("interactive", help="Interactively generate content")
     interactive_parser.add_argument("--model", required=True, help="ID of the fine-tuned model")
+    interactive_parser.add_argument("--cache-ttl", type=float, default=0,
+                                    help="Reuse identical responses for this many seconds (0 = off)")
+    
+    # Batch generation command
+    batch_parser = subparsers.add_parser("batch", help="Generate content for many jobs concurrently")
+    batch_parser.add_argument("--jobs", required=True,
+                              help='JSONL file with one {"template": ..., "params": {...}} object per line')
+    batch_parser.add_argument("--model", required=True, help="ID of the fine-tuned model")
+    batch_parser.add_argument("--cache-ttl", type=float, default=0,
+                              help="Reuse identical responses for this many seconds (0 = off)")
+    batch_parser.add_argument("--output", help="Path to a JSONL file for the results (default: print)")
+    batch_parser.add_argument("--concurrency", type=int, default=8, help="Maximum requests in flight")
+    batch_parser.add_argument("--rpm", type=float, default=500, help="Requests per minute budget (match your account limit)")
+    batch_parser.add_argument("--tpm", type=float, default=200_000, help="Tokens per minute budget (match your account limit)")
     
     # Parse arguments
     args = parser.parse_args()
@@ -382,27 +848,38 @@ def main():
             print(f"Error: {str(e)}")
             
     elif args.command == "generate":
-        generator = ContentGenerator(args.model)
+        generator = ContentGenerator(args.model, cache_ttl=args.cache_ttl)
         try:
             params = generator.fill_template_params(args.template_name)
-            content = generator.generate_content(args.template_name, params)
             
             if args.output:
+                content = generator.generate_content(args.template_name, params)
                 with open(args.output, 'w', encoding='utf-8') as f:
                     f.write(content)
                 print(f"Content saved to {args.output}")
             else:
-                print("\nGenerated content:")
-                print("=" * 50)
-                print(content)
-                print("=" * 50)
+                print_stream(generator.generate_content_stream(args.template_name, params))
         except Exception as e:
             print(f"Error: {str(e)}")
             
     elif args.command == "interactive":
-        generator = ContentGenerator(args.model)
+        generator = ContentGenerator(args.model, cache_ttl=args.cache_ttl)
         generator.interactive_session()
         
+    elif args.command == "batch":
+        generator = ContentGenerator(args.model, cache_ttl=args.cache_ttl)
+        failures = asyncio.run(generator.run_parallel(
+            args.jobs, args.output,
+            max_requests_per_minute=args.rpm,
+            max_tokens_per_minute=args.tpm,
+            max_in_flight=args.concurrency,
+        ))
+        # Status goes to stderr: without --output the results themselves are on stdout
+        if args.output:
+            print(f"Results saved to {args.output}", file=sys.stderr)
+        if failures:
+            print(f"{failures} job(s) failed; see the 'error' field in the results", file=sys.stderr)
+        
     else:
         parser.print_help()
 
@@ -23,13 +23,320 @@ Notes for students:
 
 import json
 import os
+import hashlib
 import re
-import glob
+import fnmatch
 import random
-from typing import List, Dict, Any, Optional, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Set, Tuple, Union
+
+try:
+    import ahocorasick  # Optional: finds every keyword in one pass (pip install pyahocorasick)
+except ImportError:  # Fall back to checking each keyword with `in`
+    ahocorasick = None
+
+try:
+    import orjson  # Optional: much faster JSON encoding (pip install orjson)
+except ImportError:  # Fall back to the standard library json module
+    orjson = None
+
+# Regex patterns are compiled once at import time and reused for every paragraph.
+# Quoted speech followed by an attribution verb ("...," she said).
+# Quantifiers are bounded to realistic lengths (a quote of up to 400 characters,
+# a few characters of punctuation, a speaker phrase of up to 80) so malformed or
+# unbalanced quotes cannot trigger runaway backtracking.
+DIALOGUE_ATTRIBUTION_RE = re.compile(
+    r'["\']([^"\'\n]{1,400})["\'][\s,.]{1,5}'
+    r'([^.\n"\']{0,80}?(?:said|asked|replied|murmured|whispered|called))'
+)
+# One or more blank (or whitespace-only) lines between paragraphs
+PARAGRAPH_BREAK_RE = re.compile(r'\n(?:[ \t]*\n)+')
+# Digit runs, for natural sorting of file names
+DIGITS_RE = re.compile(r'(\d+)')
+
+# Filename prefixes reported by process_files (see the naming conventions above)
+CATEGORY_PREFIXES = ("chapter_", "char_", "lore_", "dossier_", "discard_")
+
+# Fields that make two extracted patterns (and so their examples) identical.
+# Narrative patterns are plain strings and are compared as-is.
+PATTERN_IDENTITY_FIELDS = {
+    'dialogue': ('dialogue', 'speaker', 'context'),
+    'descriptive': ('content', 'type'),
+    'plot': ('content', 'context'),
+}
+
+# Keyword cues used by extract_patterns (matched as substrings of the lowercased paragraph)
+TRANSITION_INDICATORS = ('later', 'meanwhile', 'that evening', 'the next day', 'moments later', 'hours later')
+CHARACTER_DEV_INDICATORS = (
+    'realized', 'understood', 'felt', 'decided', 'changed',
+    'remembered', 'questioned', 'wondered', 'recognized'
+)
+ACTION_INDICATORS = (
+    'suddenly', 'quickly', 'immediately', 'rushed', 'leaped',
+    'spun', 'grabbed', 'attacked', 'defended', 'escaped'
+)
+DESCRIPTIVE_INDICATORS = {
+    'environmental': ('room', 'building', 'city', 'street', 'office', 'space'),
+    'emotional': ('felt', 'feeling', 'emotion', 'anxiety', 'fear', 'hope'),
+    'physical': ('looked', 'appeared', 'wore', 'carried', 'moved'),
+    'atmospheric': ('air', 'light', 'shadow', 'silence', 'sound'),
+    'technical': ('system', 'code', 'network', 'device', 'screen', 'data')
+}
+PLOT_INDICATORS = (
+    'discovered', 'revealed', 'changed', 'learned', 'understood',
+    'planned', 'decided', 'confronted', 'escaped', 'succeeded', 'failed'
+)
+NARRATIVE_INDICATORS = frozenset(TRANSITION_INDICATORS + CHARACTER_DEV_INDICATORS + ACTION_INDICATORS)
+ALL_INDICATORS = frozenset(
+    TRANSITION_INDICATORS + CHARACTER_DEV_INDICATORS + ACTION_INDICATORS + PLOT_INDICATORS
+    + sum(DESCRIPTIVE_INDICATORS.values(), ())
+)
+
+
+def _build_keyword_automaton(keywords: Iterable[str]):
+    """Build an Aho-Corasick automaton over keywords (None if pyahocorasick is missing)."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+
+_INDICATOR_AUTOMATON = _build_keyword_automaton(ALL_INDICATORS)
+
+
+def find_indicators(lowered: str) -> Set[str]:
+    """Return every indicator keyword that appears in an already-lowercased paragraph.
+
+    With pyahocorasick installed the paragraph is scanned once no matter how
+    many keywords there are; otherwise each keyword is checked with `in`.
+    """
+    if _INDICATOR_AUTOMATON is not None:
+        return {keyword for _, keyword in _INDICATOR_AUTOMATON.iter(lowered)}
+    return {keyword for keyword in ALL_INDICATORS if keyword in lowered}
+
+
+def _non_blank(pieces: Iterable[str]) -> Iterator[str]:
+    """Drop empty or whitespace-only pieces left at the start or end of a text."""
+    return (piece for piece in pieces if piece and not piece.isspace())
+
+
+def split_paragraphs(content: str) -> Iterator[str]:
+    """Split text on runs of blank lines; no empty paragraphs are produced."""
+    return _non_blank(PARAGRAPH_BREAK_RE.split(content))
+
+
+def iter_paragraphs(path: str, chunk_size: int = 64 * 1024) -> Iterator[str]:
+    """Yield the paragraphs of a text file without reading it all into memory.
+
+    Gives the same paragraphs as ``split_paragraphs(f.read())``, but only the
+    current chunk plus an unfinished trailing paragraph are held at any time.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        tail = ''
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            buffer = tail + chunk
+            # Only split up to the last visible character: a run of blank lines
+            # at the very end might continue in the next chunk.
+            end = len(buffer.rstrip())
+            pieces = PARAGRAPH_BREAK_RE.split(buffer[:end])
+            tail = pieces.pop() + buffer[end:]
+            yield from _non_blank(pieces)
+        yield from split_paragraphs(tail)
+
+
+def as_paragraphs(content: Union[str, Iterable[str]]) -> Iterable[str]:
+    """Split text into paragraphs, or pass through content that is already split.
+
+    Lets a file be split once and the same paragraph list handed to every extractor.
+    """
+    return split_paragraphs(content) if isinstance(content, str) else content
+
+
+def jsonl_line(example: Dict[str, Any]) -> bytes:
+    """Encode one example as a UTF-8 JSONL line, using orjson when it is installed.
+
+    The json fallback uses compact separators and keeps non-ASCII text as-is,
+    so both paths produce the same small output.
+    """
+    if orjson is not None:
+        return orjson.dumps(example) + b'\n'
+    return json.dumps(example, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+def _with_neighbors(items: Iterable[str]) -> Iterator[Tuple[Optional[str], str, Optional[str]]]:
+    """Yield (previous, current, next) for each item; missing neighbours are None."""
+    iterator = iter(items)
+    previous = None
+    current = next(iterator, None)
+    while current is not None:
+        following = next(iterator, None)
+        yield previous, current, following
+        previous, current = current, following
+
+
+def extract_paragraph_patterns(content: Union[str, Iterable[str]]) -> Dict[str, List[Any]]:
+    """Extract writing patterns from content.
+
+    Args:
+        content: Full text, or an iterable of paragraphs (see iter_paragraphs).
+
+    Returns:
+        Dict with 'dialogue', 'narrative', 'descriptive' and 'plot' lists.
+    """
+    paragraphs = as_paragraphs(content)
+    patterns: Dict[str, List[Any]] = {'dialogue': [], 'narrative': [], 'descriptive': [], 'plot': []}
+    # Bind the append methods once; the loop below calls them for every match
+    add_dialogue = patterns['dialogue'].append
+    add_narrative = patterns['narrative'].append
+    add_descriptive = patterns['descriptive'].append
+    add_plot = patterns['plot'].append
+
+    for previous, raw, following in _with_neighbors(paragraphs):
+        para = raw.strip()
+        if len(para) < 100:  # Skip short paragraphs
+            continue
+
+        # Extract dialogue with context (the full paragraph); matches are
+        # consumed as they are found rather than collected into a list first
+        for match in DIALOGUE_ATTRIBUTION_RE.finditer(para):
+            add_dialogue({
+                'dialogue': match.group(1).strip(),
+                'speaker': match.group(2).strip() if match.group(2) else 'character',
+                'context': para
+            })
+
+        # Find every keyword cue in one scan; the checks below are set lookups
+        found = find_indicators(para.lower())
+
+        # Extract scene transitions, character development moments, and action.
+        # A paragraph matching several of these is still stored only once.
+        if not found.isdisjoint(NARRATIVE_INDICATORS):
+            add_narrative(para)
+
+        # Extract descriptive passages
+        for desc_type, indicators in DESCRIPTIVE_INDICATORS.items():
+            if not found.isdisjoint(indicators):
+                add_descriptive({
+                    'content': para,
+                    'type': desc_type
+                })
+
+        # Extract plot developments with context
+        matches = [k for k in PLOT_INDICATORS if k in found]
+        if matches:
+            # Get surrounding context if available
+            context = '\n\n'.join(p for p in (previous, raw, following) if p is not None)
+
+            add_plot({
+                'content': para,
+                'context': context,
+                'keywords': matches,
+                'type': 'plot_development'
+            })
+
+    return patterns
+
+
+# Any edit to this script (for example new indicator keywords) changes the
+# fingerprint, so cached results from an older version are never reused.
+with open(__file__, 'rb') as _script:
+    _SCRIPT_FINGERPRINT = hashlib.sha1(_script.read()).hexdigest()
+
+
+def _cache_file_for(path: str, cache_dir: str) -> str:
+    """Return the cache file for a source file.
+
+    There is one file per source path, so re-scanning an edited file
+    overwrites its old entry instead of adding another one.
+    """
+    key = os.path.abspath(path)
+    return os.path.join(cache_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.json')
+
+
+def _cache_signature(path: str) -> str:
+    """Describe the source file's current version (and this script's) for cache checks."""
+    st = os.stat(path)
+    return f"{_SCRIPT_FINGERPRINT}|{st.st_mtime_ns}|{st.st_size}"
+
+
+def _read_cache(cache_file: str, signature: str) -> Optional[Dict[str, List[Any]]]:
+    """Load cached patterns, or None if there is no entry for this version of the file."""
+    try:
+        with open(cache_file, 'rb') as f:
+            data = f.read()
+        entry = orjson.loads(data) if orjson is not None else json.loads(data)
+    except (OSError, ValueError):  # Missing or corrupt entry: extract again
+        return None
+    if not isinstance(entry, dict) or entry.get('signature') != signature:
+        return None  # File or script changed since this entry was written
+    return entry.get('patterns')
+
+
+def _write_cache(cache_file: str, signature: str, patterns: Dict[str, List[Any]]) -> None:
+    """Save patterns for next time; failures are ignored (the cache is only a speed-up)."""
+    entry = {'signature': signature, 'patterns': patterns}
+    temp_file = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        with open(temp_file, 'wb') as f:
+            f.write(orjson.dumps(entry) if orjson is not None else json.dumps(entry).encode('utf-8'))
+        os.replace(temp_file, cache_file)  # Atomic, so readers never see half a file
+    except OSError:
+        pass
+
+
+def _prune_cache(cache_dir: str, paths: Iterable[str]) -> None:
+    """Delete cache entries for files that were not scanned this time (removed, renamed or ignored)."""
+    keep = {os.path.basename(_cache_file_for(path, cache_dir)) for path in paths}
+    try:
+        with os.scandir(cache_dir) as entries:
+            stale = [entry.path for entry in entries
+                     if entry.name.endswith(('.json', '.tmp')) and entry.name not in keep]
+    except OSError:
+        return
+    for stale_file in stale:
+        try:
+            os.remove(stale_file)
+        except OSError:
+            pass
+
+
+def extract_from_file(path: str, cache_dir: Optional[str] = None) -> Tuple[Optional[Dict[str, List[Any]]], Optional[str]]:
+    """Extract patterns from one file; safe to run in a worker process.
+
+    Args:
+        path: Source file to scan.
+        cache_dir: Folder for cached results. Unchanged files (same path, modification
+            time and size) are loaded from here instead of being scanned again.
+
+    Returns:
+        (patterns, None) on success, or (None, message) if the file was skipped.
+    """
+    try:
+        cache_file = _cache_file_for(path, cache_dir) if cache_dir else None
+        if cache_file:
+            signature = _cache_signature(path)
+            cached = _read_cache(cache_file, signature)
+            if cached is not None:
+                return cached, None
+        patterns = extract_paragraph_patterns(iter_paragraphs(path))
+        if cache_file:
+            _write_cache(cache_file, signature, patterns)
+        return patterns, None
+    except UnicodeDecodeError:
+        return None, f"Skipping (decode error): {path}"
+    except OSError as e:
+        return None, f"Skipping ({e.__class__.__name__}): {path} -> {e}"
 
 class DatasetBuilder:
-    def __init__(self, source_dir: str, output_dir: str, file_pattern: str = "*.md", ignore_prefixes: Optional[Iterable[str]] = None):
+    def __init__(self, source_dir: str, output_dir: str, file_pattern: str = "*.md", ignore_prefixes: Optional[Iterable[str]] = None,
+                 workers: Optional[int] = None, use_cache: bool = True):
         """Initialize the dataset builder.
 
         Args:
@@ -37,6 +344,8 @@ class DatasetBuilder:
             output_dir: Directory to save output JSONL datasets.
             file_pattern: Glob pattern to match source files (default: *.md).
             ignore_prefixes: Iterable of filename prefixes (e.g. ("draft_", "old_")) to skip.
+            workers: Processes used to scan files in parallel (default: one per CPU; 1 = no pool).
+            use_cache: Reuse scan results for unchanged files (stored in <output_dir>/.scan_cache).
 
         Notes:
             - No API calls are made here; everything is local text processing.
@@ -46,6 +355,8 @@ class DatasetBuilder:
         self.output_dir = output_dir
         self.file_pattern = file_pattern
         self.ignore_prefixes = tuple(ignore_prefixes) if ignore_prefixes else tuple()
+        self.workers = workers or os.cpu_count() or 1
+        self.cache_dir = os.path.join(output_dir, '.scan_cache') if use_cache else None
         os.makedirs(output_dir, exist_ok=True)
 
         # Initialize pattern storage
@@ -53,6 +364,8 @@ class DatasetBuilder:
         self.narrative_patterns: List[str] = []
         self.descriptive_patterns: List[Dict[str, Any]] = []
         self.plot_patterns: List[Dict[str, Any]] = []
+        # Patterns already stored, so repeats are skipped (see _merge)
+        self._seen_patterns: Dict[str, set] = {kind: set() for kind in ('dialogue', 'narrative', 'descriptive', 'plot')}
 
         # Load prompt templates
         self.prompts = self._load_prompts()
@@ -62,64 +375,75 @@ class DatasetBuilder:
         prompts = {}
         prompt_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'prompts')
         
-        for prompt_file in glob.glob(f"{prompt_dir}/*.json"):
-            prompt_type = os.path.splitext(os.path.basename(prompt_file))[0]
-            with open(prompt_file, 'r', encoding='utf-8') as f:
+        for entry in os.scandir(prompt_dir):
+            if not (entry.name.endswith('.json') and entry.is_file()):
+                continue
+            prompt_type = os.path.splitext(entry.name)[0]
+            with open(entry.path, 'r', encoding='utf-8') as f:
                 prompts[prompt_type] = json.load(f)
                 
         return prompts
     
-    def _natural_key(self, name: str):
-        """Return a key for natural sorting (chapter2 before chapter10)."""
-        import re as _re
-        return [int(text) if text.isdigit() else text.lower() for text in _re.split(r'(\d+)', name)]
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def _natural_key(name: str) -> tuple:
+        """Return a key for natural sorting (chapter2 before chapter10).
+
+        Cached, since the same file names come up on every run of process_files.
+        """
+        return tuple(int(text) if text.isdigit() else text.lower() for text in DIGITS_RE.split(name))
 
     def process_files(self) -> None:
         """Process all matching files in the source directory respecting ignore rules."""
         print(f"Processing files in {self.source_dir} (pattern: {self.file_pattern})...")
 
-        pattern_path = os.path.join(self.source_dir, self.file_pattern)
-        candidate_files = glob.glob(pattern_path)
+        # os.scandir returns names and file types in one directory read, so
+        # filtering needs no extra stat calls (unlike glob's per-entry checks).
+        # Entries carry their file name, so nothing below re-parses paths.
+        try:
+            candidates = [entry for entry in os.scandir(self.source_dir)
+                          if fnmatch.fnmatch(entry.name, self.file_pattern) and entry.is_file()]
+        except FileNotFoundError:
+            candidates = []
 
-        def _is_ignored(filename: str) -> bool:
-            base = os.path.basename(filename)
-            if base.startswith('.'):
+        def _is_ignored(name: str) -> bool:
+            if name.startswith('.'):
                 return True
-            return any(base.startswith(pref) for pref in self.ignore_prefixes)
+            return name.startswith(self.ignore_prefixes)
 
-        markdown_files = [f for f in candidate_files if f.lower().endswith('.md') and not _is_ignored(f)]
-        markdown_files.sort(key=lambda p: self._natural_key(os.path.basename(p)))
+        entries = [e for e in candidates if e.name.lower().endswith('.md') and not _is_ignored(e.name)]
+        entries.sort(key=lambda e: self._natural_key(e.name))
+        markdown_files = [e.path for e in entries]
+        file_names = [e.name for e in entries]
 
         if not markdown_files:
             print("⚠️  No source files matched. Adjust naming or pattern.")
             return
 
         # Report category counts (helps students verify naming)
-        categories = {"chapter_":0, "char_":0, "lore_":0, "dossier_":0, "discard_":0, "other":0}
-        for fp in markdown_files:
-            base = os.path.basename(fp).lower()
-            matched = False
-            for pref in list(categories.keys())[:-1]:  # exclude 'other'
-                if base.startswith(pref):
-                    categories[pref] += 1
-                    matched = True
-                    break
-            if not matched:
-                categories["other"] += 1
+        categories = dict.fromkeys(CATEGORY_PREFIXES + ("other",), 0)
+        for name in file_names:
+            base = name.lower()
+            category = next((pref for pref in CATEGORY_PREFIXES if base.startswith(pref)), "other")
+            categories[category] += 1
         print("Category counts:")
         for k,v in categories.items():
             print(f"  {k:<9} {v}")
 
-        for file_path in markdown_files:
-            print(f"Processing {os.path.basename(file_path)}...")
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    self.extract_patterns(content)
-            except UnicodeDecodeError:
-                print(f"Skipping (decode error): {file_path}")
-            except OSError as e:
-                print(f"Skipping ({e.__class__.__name__}): {file_path} -> {e}")
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        extract = partial(extract_from_file, cache_dir=self.cache_dir)
+
+        # Files are independent, so scan them in worker processes when there are several.
+        # map() returns results in input order, keeping the output deterministic.
+        workers = min(self.workers, len(markdown_files))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                self._collect(file_names, executor.map(extract, markdown_files, chunksize=4))
+        else:
+            self._collect(file_names, map(extract, markdown_files))
+        if self.cache_dir:
+            _prune_cache(self.cache_dir, markdown_files)
         
         print("\nProcessing complete!")
         print(f"Found {len(self.dialogue_patterns)} dialogue patterns")
@@ -128,136 +452,67 @@ class DatasetBuilder:
         print(f"Found {len(self.plot_patterns)} plot patterns")
         
 
-    def extract_patterns(self, content: str) -> None:
-        """Extract writing patterns from content"""
-        paragraphs = content.split('\n\n')
-        
-        for i, para in enumerate(paragraphs):
-            para = para.strip()
-            if len(para) < 100:  # Skip short paragraphs
-                continue
-                
-            # Extract dialogue with context
-            dialogue_matches = list(re.finditer(r'["\']([^"\']+)[\'"][\s,.]+((?:[^."\']+)?(?:said|asked|replied|murmured|whispered|called))', para))
-            if dialogue_matches:
-                context = para  # Full paragraph for context
-                for match in dialogue_matches:
-                    self.dialogue_patterns.append({
-                        'dialogue': match.group(1).strip(),
-                        'speaker': match.group(2).strip() if match.group(2) else 'character',
-                        'context': context
-                    })
-            
-            # Extract scene transitions
-            transition_indicators = ['later', 'meanwhile', 'that evening', 'the next day', 'moments later', 'hours later']
-            if any(indicator in para.lower() for indicator in transition_indicators):
-                self.narrative_patterns.append(para)
-                
-            # Extract character development moments
-            character_dev_indicators = [
-                'realized', 'understood', 'felt', 'decided', 'changed', 
-                'remembered', 'questioned', 'wondered', 'recognized'
-            ]
-            if any(indicator in para.lower() for indicator in character_dev_indicators):
-                self.narrative_patterns.append(para)
-            
-            # Extract action and plot development
-            action_indicators = [
-                'suddenly', 'quickly', 'immediately', 'rushed', 'leaped',
-                'spun', 'grabbed', 'attacked', 'defended', 'escaped'
-            ]
-            if any(indicator in para.lower() for indicator in action_indicators):
-                self.narrative_patterns.append(para)
-            
-            # Extract descriptive passages
-            descriptive_indicators = {
-                'environmental': ['room', 'building', 'city', 'street', 'office', 'space'],
-                'emotional': ['felt', 'feeling', 'emotion', 'anxiety', 'fear', 'hope'],
-                'physical': ['looked', 'appeared', 'wore', 'carried', 'moved'],
-                'atmospheric': ['air', 'light', 'shadow', 'silence', 'sound'],
-                'technical': ['system', 'code', 'network', 'device', 'screen', 'data']
-            }
-            
-            for desc_type, indicators in descriptive_indicators.items():
-                if any(indicator in para.lower() for indicator in indicators):
-                    self.descriptive_patterns.append({
-                        'content': para,
-                        'type': desc_type
-                    })
-            
-            # Extract plot developments with context
-            plot_indicators = [
-                'discovered', 'revealed', 'changed', 'learned', 'understood',
-                'planned', 'decided', 'confronted', 'escaped', 'succeeded', 'failed'
-            ]
-            matches = [k for k in plot_indicators if k in para.lower()]
-            if matches:
-                # Get surrounding context if available
-                context_start = max(0, i - 1)
-                context_end = min(len(paragraphs), i + 2)
-                context = '\n\n'.join(paragraphs[context_start:context_end])
-                
-                self.plot_patterns.append({
-                    'content': para,
-                    'context': context,
-                    'keywords': matches,
-                    'type': 'plot_development'
-                })
-        
-    def _extract_dialogue_patterns(self, content):
-        """Extract dialogue patterns from content
-        
+    def _collect(self, names: List[str], results: Iterable[Tuple[Optional[Dict[str, List[Any]]], Optional[str]]]) -> None:
+        """Merge per-file results in order, reporting any skipped files."""
+        for name, (patterns, error) in zip(names, results):
+            print(f"Processing {name}...")
+            if error:
+                print(error)
+            else:
+                self._merge(patterns)
+
+    def extract_patterns(self, content: Union[str, Iterable[str]]) -> None:
+        """Extract writing patterns from content and add them to this builder.
+
         Args:
-            content (str): The file content
+            content: Full text, or an iterable of paragraphs (see iter_paragraphs).
         """
-        # Look for any quoted speech with speaker attribution
-        dialogue_matches = re.findall(r'["\']([^"\']+)[\'"]\s*(?:,\s*|\.?\s+)([^\.]+?)(?:said|murmured|whispered|spoke|called|replied|asked|answered)', content)
-        
-        # Also look for dialogue exchanges
-        dialogue_exchanges = re.findall(r'["\']([^"\']+)[\'"]\s*(?:[^"\']{1,100})\s*["\']([^"\']+)[\'"]', content)
-        
-        # Process single dialogue lines
-        for match in dialogue_matches:
-            if len(match) >= 2:  # We have the quote and the speaker attribution
-                self.dialogue_patterns.append({
-                    "speaker": match[1].strip(),
-                    "dialogue": match[0].strip()
-                })
-            
-        # Process dialogue exchanges
-        for match in dialogue_exchanges:
-            if len(match) >= 2:
-                self.dialogue_patterns.append({
-                    "dialogue": match[0].strip() + ' ' + match[1].strip(),
-                    "speaker": "multiple"
-                })
-    
-    def _extract_narrative_patterns(self, content):
-        """Extract narrative style patterns
-        
-        Args:
-            content (str): The file content
+        self._merge(extract_paragraph_patterns(content))
+
+    def _merge(self, patterns: Dict[str, List[Any]]) -> None:
+        """Append one file's extracted patterns to the builder's running lists.
+
+        Exact repeats are skipped: the same paragraph can appear in more than one
+        file, and each copy would otherwise become an identical training example
+        that only adds fine-tuning cost.
         """
-        # Extract longer narrative paragraphs
-        paragraphs = re.split(r'\n\n+', content)
-        for para in paragraphs:
-            # Skip dialogue-heavy paragraphs
-            if para.count('"') < 4 and len(para.strip()) > 200:
-                self.narrative_patterns.append(para.strip())
-    
+        stores = {
+            'dialogue': self.dialogue_patterns,
+            'narrative': self.narrative_patterns,
+            'descriptive': self.descriptive_patterns,
+            'plot': self.plot_patterns,
+        }
+        for kind, store in stores.items():
+            seen = self._seen_patterns[kind]
+            fields = PATTERN_IDENTITY_FIELDS.get(kind)
+            for pattern in patterns[kind]:
+                key = tuple(pattern.get(field) for field in fields) if fields else pattern
+                if key not in seen:
+                    seen.add(key)
+                    store.append(pattern)
+        
     def create_examples(self) -> List[Dict[str, Any]]:
         """Create training examples from extracted patterns"""
-        examples = []
-        
+        return list(self.iter_examples())
+
+    def iter_examples(self) -> Iterator[Dict[str, Any]]:
+        """Yield training examples one at a time (one per extracted pattern)."""
+        # Prompt text is identical across many examples, so each distinct string is
+        # built once and shared by reference instead of re-rendered per example.
+
+        # Look up each template once; the loops below only touch local names
+        dialogue_prompt = self.prompts["dialogue"]
+        narrative_prompt = self.prompts["narrative"]
+        descriptive_prompt = self.prompts["descriptive_prose"]
+
         # Create dialogue examples
+        # Format system prompt with character roles if available
+        system_prompt = dialogue_prompt["system"].replace(
+            "{character_a}", "the speaker"
+        ).replace(
+            "{character_b}", "the listener"
+        )
         for pattern in self.dialogue_patterns:
-            # Format system prompt with character roles if available
-            system_prompt = self.prompts["dialogue"]["system"].replace(
-                "{character_a}", "the speaker"
-            ).replace(
-                "{character_b}", "the listener"
-            )
-            
             example = {
                 "messages": [
                     {"role": "system", "content": system_prompt},
@@ -268,54 +523,64 @@ class DatasetBuilder:
                     }
                 ]
             }
-            examples.append(example)
+            yield example
         
         # Create narrative examples
+        narrative_system_prompt = narrative_prompt["system"]
+        narrative_user_prompts: Dict[str, str] = {}
         for pattern in self.narrative_patterns:
             # Get pattern type based on content
-            if "suddenly" in pattern.lower() or "quickly" in pattern.lower():
+            lowered = pattern.lower()
+            if "suddenly" in lowered or "quickly" in lowered:
                 scenario = "an action sequence"
-            elif "later" in pattern.lower() or "meanwhile" in pattern.lower():
+            elif "later" in lowered or "meanwhile" in lowered:
                 scenario = "a scene transition"
-            elif "realized" in pattern.lower() or "felt" in pattern.lower():
+            elif "realized" in lowered or "felt" in lowered:
                 scenario = "a character development moment"
             else:
                 scenario = "advancing the plot"
                 
-            user_prompt = self.prompts["narrative"]["user"].replace("{scenario}", scenario)
+            user_prompt = narrative_user_prompts.get(scenario)
+            if user_prompt is None:
+                user_prompt = narrative_prompt["user"].replace("{scenario}", scenario)
+                narrative_user_prompts[scenario] = user_prompt
             
             example = {
                 "messages": [
-                    {"role": "system", "content": self.prompts["narrative"]["system"]},
+                    {"role": "system", "content": narrative_system_prompt},
                     {"role": "user", "content": user_prompt},
                     {"role": "assistant", "content": pattern}
                 ]
             }
-            examples.append(example)
+            yield example
         
         # Create descriptive examples
+        descriptive_prompts: Dict[str, tuple[str, str]] = {}
         for pattern in self.descriptive_patterns:
             desc_type = pattern.get('type', 'physical')
             content = pattern.get('content', pattern)  # Fallback for old format
-            
-            system_prompt = self.prompts["descriptive_prose"]["system"].replace(
-                "{desc_type}", desc_type
-            ).replace(
-                "{style_focus}", self.prompts["descriptive_prose"]["parameters"]["style_focus"].get(desc_type, "sensory details")
-            )
-            
-            # Select appropriate element based on type
-            elements = self.prompts["descriptive_prose"]["parameters"]["element"]
-            if desc_type == "environmental":
-                element = "a significant location"
-            elif desc_type == "emotional":
-                element = "a tense confrontation scene"
-            elif desc_type == "technical":
-                element = "a complex system or process"
-            else:
-                element = elements[0]
-                
-            user_prompt = self.prompts["descriptive_prose"]["user"].replace("{element}", element)
+
+            if desc_type not in descriptive_prompts:
+                system_prompt = descriptive_prompt["system"].replace(
+                    "{desc_type}", desc_type
+                ).replace(
+                    "{style_focus}", descriptive_prompt["parameters"]["style_focus"].get(desc_type, "sensory details")
+                )
+
+                # Select appropriate element based on type
+                elements = descriptive_prompt["parameters"]["element"]
+                if desc_type == "environmental":
+                    element = "a significant location"
+                elif desc_type == "emotional":
+                    element = "a tense confrontation scene"
+                elif desc_type == "technical":
+                    element = "a complex system or process"
+                else:
+                    element = elements[0]
+
+                user_prompt = descriptive_prompt["user"].replace("{element}", element)
+                descriptive_prompts[desc_type] = (system_prompt, user_prompt)
+            system_prompt, user_prompt = descriptive_prompts[desc_type]
             
             example = {
                 "messages": [
@@ -324,277 +589,60 @@ class DatasetBuilder:
                     {"role": "assistant", "content": content}
                 ]
             }
-            examples.append(example)
-        
-        return examples
+            yield example
     
     def generate_datasets(self) -> tuple[str, str]:
         """Generate training and validation datasets
+
+        Examples are split 80/20 at random and each file is shuffled, so
+        neither lists the examples grouped by category.
         
         Returns:
             tuple[str, str]: Paths to training and validation files
         """
-        examples = self.create_examples()
-        random.shuffle(examples)
-        
-        # Split into training (80%) and validation (20%) sets
-        split_point = int(len(examples) * 0.8)
-        training_examples = examples[:split_point]
-        validation_examples = examples[split_point:]
-        
-        # Save datasets
-        training_path = os.path.join(self.output_dir, 'training_finetune_dataset.jsonl')
-        validation_path = os.path.join(self.output_dir, 'validation_finetune_dataset.jsonl')
-        
-        with open(training_path, 'w', encoding='utf-8') as f:
-            for example in training_examples:
-                f.write(json.dumps(example) + '\n')
-                
-        with open(validation_path, 'w', encoding='utf-8') as f:
-            for example in validation_examples:
-                f.write(json.dumps(example) + '\n')
-        
-        print(f"\nDataset generation complete!")
-        print(f"Training examples: {len(training_examples)}")
-        print(f"Validation examples: {len(validation_examples)}")
-        print(f"\nFiles saved to:")
-        print(f"Training: {training_path}")
-        print(f"Validation: {validation_path}")
-        
-        return training_path, validation_path
-    
-    def _extract_plot_patterns(self, content):
-        """Extract plot development patterns from content
-        
-        Args:
-            content (str): The file content
-        """
-        # Plot development keywords
-        plot_keywords = [
-            'motivation', 'conflict', 'plan', 'mission', 'goal', 'discover', 
-            'reveal', 'change', 'decision', 'consequence', 'react', 'impact',
-            'begin', 'end', 'finally', 'suddenly', 'realize'
-        ]
-        
-        # Look for paragraphs with plot development
-        paragraphs = content.split('\n\n')
-        for para in paragraphs:
-            if len(para.strip()) > 100:  # Substantial paragraph
-                # Check for plot keywords
-                matches = [k for k in plot_keywords if k.lower() in para.lower()]
-                if matches:
-                    # Check if paragraph advances the plot
-                    signals = ['but', 'however', 'suddenly', 'realized', 'decided',
-                             'changed', 'discovered', 'revealed', 'finally']
-                    has_plot_signal = any(s in para.lower() for s in signals)
-                    
-                    if has_plot_signal or len(matches) >= 2:
-                        self.plot_patterns.append({
-                            'content': para.strip(),
-                            'keywords': matches,
-                            'type': 'plot_development'
-                        })
-
-    def _create_dialogue_examples(self) -> List[Dict]:
-        """Create training examples for dialogue
-        
-        Returns:
-            List[Dict]: List of formatted training examples
-        """
-        examples = []
-        
-        # Character roles and relationships
-        character_pairs = [
-            ("mentor", "student"),
-            ("rival", "competitor"),
-            ("authority", "subordinate"),
-            ("protagonist", "adversary"),
-            ("ally", "confidant")
-        ]
-        
-        # Topics for dialogue
-        topics = [
-            "discovered threat",
-            "crucial information",
-            "strategic planning",
-            "loyalty question",
-            "hidden truth",
-            "negotiation",
-            "confrontation",
-            "revelation"
-        ]
-        
-        # Create examples for each dialogue pattern
-        for pattern in self.dialogue_patterns:
-            # Randomly select a character pair and topic
-            char_pair = random.choice(character_pairs)
-            topic = random.choice(topics)
-            
-            if pattern["speaker"] == "multiple":
-                # It's a dialogue exchange
-                dialogues = pattern["dialogue"].split('" "')  # Split at dialogue boundary
-                example = {
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You are a creative writing assistant specializing in dialogue. Create natural, character-driven conversations that reveal personality and advance the story."
-                        },
-                        {
-                            "role": "user",
-                            "content": f"Write a dialogue exchange about {topic} between {char_pair[0]} and {char_pair[1]}."
-                        },
-                        {
-                            "role": "assistant",
-                            "content": f"\"{dialogues[0]}\" {char_pair[0]} said.\n\n\"{dialogues[1]}\" {char_pair[1]} replied."
-                        }
-                    ]
-                }
+        # Each pattern becomes exactly one example, so the total is known up front
+        total = len(self.dialogue_patterns) + len(self.narrative_patterns) + len(self.descriptive_patterns)
+
+        # Split into training (80%) and validation (20%) sets.
+        # Each example goes to validation with probability (validation slots left /
+        # examples left), which fills exactly the 20% quota with a uniformly random
+        # choice. Examples are kept as encoded JSONL lines (no dicts held) and each
+        # split is shuffled before writing, since iter_examples yields them by category.
+        split_point = int(total * 0.8)
+        validation_left = total - split_point
+        remaining = total
+        training_lines: List[bytes] = []
+        validation_lines: List[bytes] = []
+        
+        for example in self.iter_examples():
+            if random.random() * remaining < validation_left:
+                validation_lines.append(jsonl_line(example))
+                validation_left -= 1
             else:
-                # Single line dialogue
-                example = {
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You are a creative writing assistant specializing in dialogue. Create natural, character-driven conversations that reveal personality and advance the story."
-                        },
-                        {
-                            "role": "user",
-                            "content": f"Write a brief dialogue about {topic} between two characters: {char_pair[0]} and {char_pair[1]}."
-                        },
-                        {
-                            "role": "assistant", 
-                            "content": f"\"{pattern['dialogue']}\" {pattern['speaker']} said."
-                        }
-                    ]
-                }
-            
-            examples.append(example)
-                    
-        return examples
-    
-    def _create_narrative_examples(self) -> List[Dict]:
-        """Create training examples for narrative style
-        
-        Returns:
-            List[Dict]: List of formatted training examples
-        """
-        examples = []
-        
-        # Narrative scenarios
-        scenarios = [
-            "introducing a new technological threat",
-            "revealing a character's hidden motivations",
-            "describing the escalation of conflict",
-            "exploring the consequences of a digital breach",
-            "setting up a confrontation between adversaries",
-            "revealing the interconnectedness of the criminal world",
-            "showing the vulnerability behind a powerful façade",
-            "exploring the clash between traditional and modern power"
-        ]
-        
-        # Create examples from available narrative patterns
-        narrative_count = min(len(self.narrative_patterns), 8)
-        for i in range(narrative_count):
-            if i >= len(self.narrative_patterns):
-                break
-                
-            scenario = scenarios[i % len(scenarios)]
-            
-            example = {
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": "You are a creative writing assistant specializing in narrative prose for the Vendetta Protocol series. Focus on gritty, high-stakes narrative that blends cyber-thriller elements with organized crime drama."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Write a narrative paragraph {scenario} in the style of Vendetta Protocol."
-                    },
-                    {
-                        "role": "assistant",
-                        "content": self.narrative_patterns[i]
-                    }
-                ]
-            }
-            examples.append(example)
-                
-        return examples
-    
-    def _create_plot_examples(self) -> List[Dict]:
-        """Create training examples for plot development
-        
-        Returns:
-            List[Dict]: List of formatted training examples
-        """
-        examples = []
-        
-        # Plot scenario templates
-        scenarios = {
-            'discovered': 'a character discovering a crucial plot element',
-            'revealed': 'revealing a hidden truth',
-            'changed': 'a significant change in circumstances',
-            'planned': 'characters planning their next move',
-            'confronted': 'a confrontation between key characters',
-            'escaped': 'characters escaping a dangerous situation',
-            'failed': 'dealing with failure and its consequences',
-            'succeeded': 'achieving a goal with unexpected results'
-        }
-        
-        for pattern in self.plot_patterns:
-            # Get the primary plot development type
-            keywords = pattern.get('keywords', [])
-            plot_type = keywords[0] if keywords else 'general'
-            scenario = scenarios.get(plot_type, 'advancing the plot')
-            
-            example = {
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": "You are a creative writing assistant specializing in plot development for high-stakes thrillers. Focus on creating compelling story developments that maintain tension and reader engagement."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Write a scene about {scenario}. Include context and consequences."
-                    },
-                    {
-                        "role": "assistant",
-                        "content": pattern.get('content', '') + '\n\nContext: ' + pattern.get('context', '')
-                    }
-                ]
-            }
-            examples.append(example)
-                
-        return examples
-        examples = self.create_examples()
-        random.shuffle(examples)
-        
-        # Split into training (80%) and validation (20%) sets
-        split_point = int(len(examples) * 0.8)
-        training_examples = examples[:split_point]
-        validation_examples = examples[split_point:]
+                training_lines.append(jsonl_line(example))
+            remaining -= 1
+        random.shuffle(training_lines)
+        random.shuffle(validation_lines)
+        training_count = len(training_lines)
+        validation_count = len(validation_lines)
         
         # Save datasets
         training_path = os.path.join(self.output_dir, 'training_finetune_dataset.jsonl')
         validation_path = os.path.join(self.output_dir, 'validation_finetune_dataset.jsonl')
         
-        with open(training_path, 'w', encoding='utf-8') as f:
-            for example in training_examples:
-                f.write(json.dumps(example) + '\n')
-                
-        with open(validation_path, 'w', encoding='utf-8') as f:
-            for example in validation_examples:
-                f.write(json.dumps(example) + '\n')
+        with open(training_path, 'wb', buffering=1 << 20) as training_file:
+            training_file.writelines(training_lines)
+        with open(validation_path, 'wb', buffering=1 << 20) as validation_file:
+            validation_file.writelines(validation_lines)
         
         print(f"\nDataset generation complete!")
-        print(f"Training examples: {len(training_examples)}")
-        print(f"Validation examples: {len(validation_examples)}")
+        print(f"Training examples: {training_count}")
+        print(f"Validation examples: {validation_count}")
         print(f"\nFiles saved to:")
         print(f"Training: {training_path}")
         print(f"Validation: {validation_path}")
         
         return training_path, validation_path
-    
-
 
 
 def main():
@@ -610,6 +658,10 @@ def main():
                         help="Glob pattern to select source files (default: *.md)")
     parser.add_argument("--ignore_prefix", action="append", default=[],
                         help="Filename prefix to ignore (repeatable). Common: discard_, dossier_, lore_, draft_, old_")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes used to scan files (default: one per CPU; 1 disables parallelism)")
+    parser.add_argument("--no_cache", action="store_true",
+                        help="Rescan every file instead of reusing results for unchanged files")
     
     args = parser.parse_args()
     
@@ -620,7 +672,9 @@ def main():
     # Create and run builder
     builder = DatasetBuilder(source_dir, output_dir,
                              file_pattern=args.file_pattern,
-                             ignore_prefixes=args.ignore_prefix)
+                             ignore_prefixes=args.ignore_prefix,
+                             workers=args.workers,
+                             use_cache=not args.no_cache)
     builder.process_files()
     builder.generate_datasets()
 
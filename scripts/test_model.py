@@ -14,15 +14,51 @@ Adult learner notes:
 """
 
 import os
-from openai import OpenAI
+import asyncio
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 
+SYSTEM_PROMPT = "You are a creative writing assistant specializing in immersive narrative fiction."
+
+
+async def run_prompts(api_key, model_id, prompts, concurrency=16):
+    """Send every prompt at once and return results in the same order.
+
+    The requests are independent, so they run concurrently instead of one after
+    another; total wait is roughly one round trip instead of one per prompt.
+
+    Args:
+        api_key: OpenAI API key
+        model_id: Model to test
+        prompts: List of user prompts
+        concurrency: Maximum requests in flight at the same time
+
+    Returns:
+        List with one response (or the exception it raised) per prompt
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with AsyncOpenAI(api_key=api_key) as client:
+        async def ask(prompt):
+            async with semaphore:
+                return await client.chat.completions.create(
+                    model=model_id,
+                    messages=[
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.7,
+                    max_tokens=500
+                )
+
+        return await asyncio.gather(*(ask(prompt) for prompt in prompts), return_exceptions=True)
+
+
 def test_model():
     # Load environment variables
     load_dotenv()
     
-    # Initialize OpenAI client
-    client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+    api_key = os.getenv('OPENAI_API_KEY')
     # Prefer FINE_TUNED_MODEL_ID, fall back to FINETUNED_MODEL for backward compatibility
     model_id = os.getenv('FINE_TUNED_MODEL_ID') or os.getenv('FINETUNED_MODEL')
     if not model_id:
@@ -37,23 +73,17 @@ def test_model():
     
     print(f"Testing fine-tuned model: {model_id}\n")
     
-    for i, prompt in enumerate(test_prompts, 1):
+    # All prompts are sent together; results are printed in the original order
+    results = asyncio.run(run_prompts(api_key, model_id, test_prompts))
+    
+    for i, (prompt, result) in enumerate(zip(test_prompts, results), 1):
         print(f"\nTest {i}: {prompt}\n")
-        try:
-            response = client.chat.completions.create(
-                model=model_id,
-                messages=[
-                    {"role": "system", "content": "You are a creative writing assistant specializing in immersive narrative fiction."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=500
-            )
-            print("Response:")
-            print(response.choices[0].message.content)
-            print("\n" + "="*50 + "\n")
-        except Exception as e:
-            print(f"Error: {e}")
+        if isinstance(result, Exception):
+            print(f"Error: {result}")
+            continue
+        print("Response:")
+        print(result.choices[0].message.content)
+        print("\n" + "="*50 + "\n")
 
 if __name__ == "__main__":
     test_model()
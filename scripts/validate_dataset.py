@@ -21,101 +21,256 @@ Adult learner notes:
 
 import json
 import os
+import re
 import sys
 import argparse
-from typing import List, Dict, Any, Tuple, Optional
+import io
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from functools import lru_cache, partial
+from typing import List, Dict, Any, Tuple, Optional, Iterator, Iterable
+
+try:
+    import orjson  # Optional: much faster JSON decoding (pip install orjson)
+except ImportError:  # Fall back to the standard library json module
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except clause covers both
+loads = orjson.loads if orjson is not None else json.loads
+
+# Files are read in 1 MB binary chunks rather than line by line
+READ_CHUNK_SIZE = 1 << 20
+
+# Roles the fine-tuning API accepts (a set, so each check is one hash lookup)
+VALID_ROLES = frozenset({"system", "user", "assistant"})
+
+# An error found while scanning: (line number, message index, description).
+# The line number is None for file-level errors, the index None for whole-example errors.
+ErrorRecord = Tuple[Optional[int], Optional[int], str]
+
+# System-message phrases used to categorize examples, highest priority first
+CATEGORY_KEYWORDS = (
+    ("character voice", "character_voice"),
+    ("descriptive prose", "descriptive_prose"),
+    ("dialogue", "dialogue"),
+    ("narrative", "narrative"),
+)
+# One case-insensitive pass finds every phrase, instead of lowercasing and searching once per phrase
+CATEGORY_RE = re.compile("|".join(re.escape(phrase) for phrase, _ in CATEGORY_KEYWORDS), re.IGNORECASE)
+
+
+def iter_jsonl_lines(file_path: str, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Tuple[int, bytes]]:
+    """Yield (line_number, raw_line) pairs from a JSONL file
+
+    Reads bytes in large chunks and splits them on newlines, which is much
+    cheaper than text-mode line iteration. Memory use stays at about one chunk
+    however big the file is; a line spanning two chunks is joined once.
+
+    Args:
+        file_path (str): Path to the JSONL file
+        chunk_size (int): Bytes to read at a time
+
+    Returns:
+        Iterator[Tuple[int, bytes]]: 1-based line numbers and line contents (without the newline)
+    """
+    line_number = 0
+    pending: List[bytes] = []  # Pieces of a line that has not ended yet
+    with open(file_path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            lines = chunk.split(b'\n')
+            if len(lines) == 1:
+                pending.append(chunk)
+                continue
+            if pending:
+                pending.append(lines[0])
+                lines[0] = b''.join(pending)
+            pending = [lines.pop()]
+            for line in lines:
+                line_number += 1
+                yield line_number, line
+    tail = b''.join(pending)
+    if tail:  # Last line had no trailing newline
+        yield line_number + 1, tail
+
+@lru_cache(maxsize=4096)
+def classify_system_message(content: str) -> str:
+    """Pick an example category from its system message
+
+    Cached: generated datasets reuse a handful of system prompts verbatim,
+    so each distinct prompt is only scanned once.
+
+    Args:
+        content (str): The system message text
+
+    Returns:
+        str: The category of the highest-priority phrase found, or "unknown"
+    """
+    found = {match.lower() for match in CATEGORY_RE.findall(content)}
+    for phrase, category in CATEGORY_KEYWORDS:
+        if phrase in found:
+            return category
+    return "unknown"
+
+
+def format_error(error: ErrorRecord) -> str:
+    """Turn an error record into a readable message like "Line 3, message 1: Missing 'role' field"
+
+    Args:
+        error (ErrorRecord): (line_number, message_index, description)
+
+    Returns:
+        str: The formatted message
+    """
+    line_number, message_index, description = error
+    if line_number is None:
+        return description
+    if message_index is None:
+        return f"Line {line_number}: {description}"
+    return f"Line {line_number}, message {message_index}: {description}"
+
+
+def scan_jsonl(file_path: str, collect_summary: bool = False, verbose: bool = False,
+               fail_fast: bool = False) -> Tuple[bool, List[ErrorRecord], Optional[Dict[str, Any]]]:
+    """Validate a JSONL file and optionally summarize it, in a single pass
+
+    Each line is read and decoded once; the summary is built from the same
+    parsed examples (and token estimates) that the checks use. Errors are
+    kept as small records and only formatted if they are printed (see
+    format_error), so a run that just needs valid/invalid never builds the text.
 
-def validate_jsonl(file_path: str, verbose: bool = False) -> Tuple[bool, List[str]]:
-    """Validate a JSONL file for OpenAI fine-tuning
-    
     Args:
         file_path (str): Path to the JSONL file
+        collect_summary (bool): Whether to also build summary statistics
         verbose (bool): Whether to print detailed error messages
+        fail_fast (bool): Stop after the first line with errors (no summary is returned then)
         
     Returns:
-        Tuple[bool, List[str]]: (is_valid, error_messages)
+        Tuple[bool, List[ErrorRecord], Optional[Dict[str, Any]]]: (is_valid, error_records, summary or None)
     """
-    errors = []
+    errors: List[ErrorRecord] = []
     line_number = 0
     
+    summary = {
+        "total_examples": 0,
+        "has_system_message": 0,
+        "avg_messages_per_example": 0,
+        "avg_tokens_per_example": 0,
+        "example_types": {}
+    } if collect_summary else None
+    # Running counts are plain locals (and a Counter for categories),
+    # copied into the summary once at the end
+    counted_examples = 0
+    system_examples = 0
+    example_types: Counter = Counter()
+    total_messages = 0
+    total_tokens = 0
+    
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line_number, line in enumerate(f, 1):
-                try:
-                    # Check if line is valid JSON
-                    example = json.loads(line)
+        for line_number, line in iter_jsonl_lines(file_path):
+            # Checked here rather than after each error, since the checks below `continue` early
+            if fail_fast and errors:
+                break
+                
+            try:
+                # Check if line is valid JSON
+                example = loads(line)
+                
+                # Check for required fields
+                if not isinstance(example, dict):
+                    errors.append((line_number, None, "Not a JSON object"))
+                    continue
+                    
+                if "messages" not in example:
+                    errors.append((line_number, None, "Missing 'messages' field"))
+                    continue
                     
-                    # Check for required fields
-                    if not isinstance(example, dict):
-                        errors.append(f"Line {line_number}: Not a JSON object")
+                messages = example["messages"]
+                
+                if not isinstance(messages, list) or len(messages) < 2:
+                    errors.append((line_number, None, "'messages' must be a list with at least 2 entries"))
+                    continue
+                    
+                # Check message format
+                for i, msg in enumerate(messages):
+                    if not isinstance(msg, dict):
+                        errors.append((line_number, i, "Not a JSON object"))
                         continue
                         
-                    if "messages" not in example:
-                        errors.append(f"Line {line_number}: Missing 'messages' field")
+                    if "role" not in msg:
+                        errors.append((line_number, i, "Missing 'role' field"))
                         continue
                         
-                    messages = example["messages"]
-                    
-                    if not isinstance(messages, list) or len(messages) < 2:
-                        errors.append(f"Line {line_number}: 'messages' must be a list with at least 2 entries")
+                    if "content" not in msg:
+                        errors.append((line_number, i, "Missing 'content' field"))
                         continue
                         
-                    # Check message format
-                    for i, msg in enumerate(messages):
-                        if not isinstance(msg, dict):
-                            errors.append(f"Line {line_number}, message {i}: Not a JSON object")
-                            continue
-                            
-                        if "role" not in msg:
-                            errors.append(f"Line {line_number}, message {i}: Missing 'role' field")
-                            continue
-                            
-                        if "content" not in msg:
-                            errors.append(f"Line {line_number}, message {i}: Missing 'content' field")
-                            continue
-                            
-                        role = msg["role"]
-                        if role not in ["system", "user", "assistant"]:
-                            errors.append(f"Line {line_number}, message {i}: Invalid role '{role}'")
-                            continue
-                            
-                        content = msg["content"]
-                        if not isinstance(content, str) or not content.strip():
-                            errors.append(f"Line {line_number}, message {i}: 'content' must be a non-empty string")
-                            continue
-                            
-                    # Check conversation format
-                    roles = [msg["role"] for msg in messages]
+                    role = msg["role"]
+                    if role not in VALID_ROLES:
+                        errors.append((line_number, i, f"Invalid role '{role}'"))
+                        continue
+                        
+                    content = msg["content"]
+                    if not isinstance(content, str) or not content.strip():
+                        errors.append((line_number, i, "'content' must be a non-empty string"))
+                        continue
+                        
+                # Check conversation format
+                roles = [msg["role"] for msg in messages]
+                
+                # Check for alternating user/assistant messages (except for optional system at start)
+                start_idx = 0
+                if roles[0] == "system":
+                    start_idx = 1
                     
+                # Fast path: a well-formed conversation is exactly user, assistant, user, assistant...
+                # so one list comparison replaces the checks below for almost every example
+                body = roles[start_idx:]
+                pairs, odd = divmod(len(body), 2)
+                if odd or body != ["user", "assistant"] * pairs:
                     # Last message must be from assistant
                     if roles[-1] != "assistant":
-                        errors.append(f"Line {line_number}: Last message must be from 'assistant'")
-                        
-                    # Check for alternating user/assistant messages (except for optional system at start)
-                    start_idx = 0
-                    if roles[0] == "system":
-                        start_idx = 1
+                        errors.append((line_number, None, "Last message must be from 'assistant'"))
                         
                     for i in range(start_idx, len(roles) - 1):
                         if roles[i] == "user" and roles[i+1] != "assistant":
-                            errors.append(f"Line {line_number}: 'user' message must be followed by 'assistant'")
+                            errors.append((line_number, None, "'user' message must be followed by 'assistant'"))
                         elif roles[i] == "assistant" and roles[i+1] != "user":
-                            errors.append(f"Line {line_number}: 'assistant' message must be followed by 'user'")
-                            
-                    # Rough token count estimate (not accurate but gives a warning)
-                    total_tokens = sum(len(msg["content"].split()) * 1.3 for msg in messages)
-                    if total_tokens > 4096:
-                        errors.append(f"Line {line_number}: Estimated token count ({int(total_tokens)}) exceeds 4096 limit")
+                            errors.append((line_number, None, "'assistant' message must be followed by 'user'"))
                         
-                except json.JSONDecodeError:
-                    errors.append(f"Line {line_number}: Invalid JSON")
-                except Exception as e:
-                    errors.append(f"Line {line_number}: {str(e)}")
+                # Rough token count estimate (not accurate but gives a warning)
+                example_tokens = sum(len(msg["content"].split()) * 1.3 for msg in messages)
+                if example_tokens > 4096:
+                    errors.append((line_number, None, f"Estimated token count ({int(example_tokens)}) exceeds 4096 limit"))
+                    
+                if summary is not None:
+                    counted_examples += 1
                     
+                    # Count messages
+                    total_messages += len(messages)
+                    total_tokens += example_tokens
+                    
+                    # Check for system message
+                    if messages[0]["role"] == "system":
+                        system_examples += 1
+                        
+                        # Categorize by system message content
+                        example_types[classify_system_message(messages[0]["content"])] += 1
+                    
+            except json.JSONDecodeError:
+                errors.append((line_number, None, "Invalid JSON"))
+            except Exception as e:
+                errors.append((line_number, None, str(e)))
+                
     except Exception as e:
-        errors.append(f"Error reading file: {str(e)}")
+        errors.append((None, None, f"Error reading file: {str(e)}"))
         
     is_valid = len(errors) == 0
+    if fail_fast and not is_valid:
+        summary = None  # Only part of the file was counted
     
     if verbose:
         if is_valid:
@@ -124,12 +279,40 @@ def validate_jsonl(file_path: str, verbose: bool = False) -> Tuple[bool, List[st
         else:
             print(f"❌ File {file_path} has {len(errors)} errors:")
             for error in errors:
-                print(f"  - {error}")
+                print(f"  - {format_error(error)}")
+            if fail_fast:
+                print("  (stopped at the first invalid line; run without --fail-fast to see every error)")
                 
-    return is_valid, errors
+    if summary is not None:
+        summary["total_examples"] = counted_examples
+        summary["has_system_message"] = system_examples
+        summary["example_types"] = dict(example_types)
+        
+        # Calculate averages
+        if counted_examples > 0:
+            summary["avg_messages_per_example"] = total_messages / counted_examples
+            summary["avg_tokens_per_example"] = total_tokens / counted_examples
+        
+    return is_valid, errors, summary
+
+def validate_jsonl(file_path: str, verbose: bool = False, fail_fast: bool = False) -> Tuple[bool, List[str]]:
+    """Validate a JSONL file for OpenAI fine-tuning
+    
+    Args:
+        file_path (str): Path to the JSONL file
+        verbose (bool): Whether to print detailed error messages
+        fail_fast (bool): Stop after the first line with errors
+        
+    Returns:
+        Tuple[bool, List[str]]: (is_valid, error_messages)
+    """
+    is_valid, errors, _ = scan_jsonl(file_path, verbose=verbose, fail_fast=fail_fast)
+    return is_valid, [format_error(error) for error in errors]
 
 def summarize_jsonl(file_path: str) -> Dict[str, Any]:
     """Generate a summary of a JSONL file
+
+    Lines that cannot be parsed as an example are left out of the counts.
     
     Args:
         file_path (str): Path to the JSONL file
@@ -137,79 +320,38 @@ def summarize_jsonl(file_path: str) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: Summary statistics
     """
-    summary = {
-        "total_examples": 0,
-        "has_system_message": 0,
-        "avg_messages_per_example": 0,
-        "avg_tokens_per_example": 0,
-        "example_types": {}
-    }
-    
-    total_messages = 0
-    total_tokens = 0
+    return scan_jsonl(file_path, collect_summary=True)[2]
+
+def _scan_file(file_path: str, collect_summary: bool, verbose: bool,
+               fail_fast: bool) -> Tuple[bool, Optional[Dict[str, Any]], str]:
+    """Scan one file and capture what it prints; safe to run in a worker process
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        for line in f:
-            summary["total_examples"] += 1
-            
-            example = json.loads(line)
-            messages = example["messages"]
-            
-            # Count messages
-            total_messages += len(messages)
-            
-            # Check for system message
-            if messages[0]["role"] == "system":
-                summary["has_system_message"] += 1
-                
-                # Categorize by system message content
-                system_content = messages[0]["content"]
-                category = "unknown"
-                
-                if "character voice" in system_content.lower():
-                    category = "character_voice"
-                elif "descriptive prose" in system_content.lower():
-                    category = "descriptive_prose"
-                elif "dialogue" in system_content.lower():
-                    category = "dialogue"
-                elif "narrative" in system_content.lower():
-                    category = "narrative"
-                    
-                summary["example_types"][category] = summary["example_types"].get(category, 0) + 1
-                
-            # Estimate tokens
-            example_tokens = sum(len(msg["content"].split()) * 1.3 for msg in messages)
-            total_tokens += example_tokens
-            
-    # Calculate averages
-    if summary["total_examples"] > 0:
-        summary["avg_messages_per_example"] = total_messages / summary["total_examples"]
-        summary["avg_tokens_per_example"] = total_tokens / summary["total_examples"]
+    Args:
+        file_path (str): Path to the JSONL file
+        collect_summary (bool): Whether to also build summary statistics
+        verbose (bool): Whether to print detailed error messages
+        fail_fast (bool): Stop after the first line with errors
         
-    return summary
+    Returns:
+        Tuple[bool, Optional[Dict[str, Any]], str]: (is_valid, summary or None, printed output)
+    """
+    if not os.path.exists(file_path):
+        return False, None, f"File not found: {file_path}\n"
+    output = io.StringIO()
+    with redirect_stdout(output):
+        is_valid, _, summary = scan_jsonl(file_path, collect_summary=collect_summary, verbose=verbose,
+                                          fail_fast=fail_fast)
+    return is_valid, summary, output.getvalue()
 
-def main():
-    """Main function to validate JSONL files"""
-    parser = argparse.ArgumentParser(description="Validate JSONL files for OpenAI fine-tuning")
-    parser.add_argument("file_paths", nargs="+", help="Paths to JSONL files to validate")
-    parser.add_argument("--verbose", "-v", action="store_true", help="Print detailed error messages")
-    parser.add_argument("--summary", "-s", action="store_true", help="Print file summary statistics")
-    
-    args = parser.parse_args()
-    
+def _report(file_paths: List[str], results: Iterable[Tuple[bool, Optional[Dict[str, Any]], str]]) -> bool:
+    """Print each file's results in the order given and return whether all were valid"""
     all_valid = True
     
-    for file_path in args.file_paths:
-        if not os.path.exists(file_path):
-            print(f"File not found: {file_path}")
-            all_valid = False
-            continue
-            
-        is_valid, errors = validate_jsonl(file_path, args.verbose)
+    for file_path, (is_valid, summary, output) in zip(file_paths, results):
+        print(output, end="")
         all_valid = all_valid and is_valid
         
-        if args.summary:
-            summary = summarize_jsonl(file_path)
+        if summary is not None and summary["total_examples"] > 0:
             print(f"\nSummary for {file_path}:")
             print(f"  Total examples: {summary['total_examples']}")
             print(f"  Examples with system message: {summary['has_system_message']} ({summary['has_system_message']/summary['total_examples']:.1%})")
@@ -218,6 +360,32 @@ def main():
             print("  Example types:")
             for category, count in summary["example_types"].items():
                 print(f"    - {category}: {count} ({count/summary['total_examples']:.1%})")
+                
+    return all_valid
+
+def main():
+    """Main function to validate JSONL files"""
+    parser = argparse.ArgumentParser(description="Validate JSONL files for OpenAI fine-tuning")
+    parser.add_argument("file_paths", nargs="+", help="Paths to JSONL files to validate")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Print detailed error messages")
+    parser.add_argument("--summary", "-s", action="store_true", help="Print file summary statistics")
+    parser.add_argument("--fail-fast", action="store_true",
+                        help="Stop checking a file at its first invalid line (handy for CI and pre-commit hooks)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes used to validate files (default: one per CPU; 1 disables parallelism)")
+    
+    args = parser.parse_args()
+    
+    scan = partial(_scan_file, collect_summary=args.summary, verbose=args.verbose, fail_fast=args.fail_fast)
+    
+    # Files are independent, so validate them in worker processes when there are several.
+    # map() returns results in input order, so output matches the order on the command line.
+    workers = min(args.workers or os.cpu_count() or 1, len(args.file_paths))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            all_valid = _report(args.file_paths, executor.map(scan, args.file_paths))
+    else:
+        all_valid = _report(args.file_paths, map(scan, args.file_paths))
     
     sys.exit(0 if all_valid else 1)
 
@@ -16,55 +16,62 @@ import stat
 from pathlib import Path
 
 
-def make_executable(path: Path) -> bool:
-    """Ensure the file at path has executable bits set for user/group/others.
+def make_executable(entry: os.DirEntry) -> bool:
+    """Ensure the file has executable bits set for user/group/others.
+
+    Reuses the DirEntry's stat result and only calls chmod when a bit is missing.
 
     Returns True if chmod was applied successfully, False otherwise.
     """
     try:
-        mode = path.stat().st_mode
-        new_mode = mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH
-        if new_mode != mode:
-            os.chmod(path, new_mode)
-        return True
-    except FileNotFoundError:
-        print(f"Skip (not found): {path}")
+        mode = entry.stat().st_mode
+    except FileNotFoundError:  # Removed after the directory was listed
+        print(f"Skip (not found): {entry.path}")
+        return False
+    except OSError as e:
+        print(f"Skip ({e.__class__.__name__}): {entry.path} -> {e}")
         return False
+
+    new_mode = mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH
+    if new_mode == mode:  # Already executable: nothing to change
+        return True
+
+    try:
+        os.chmod(entry.path, new_mode)
     except PermissionError:
-        print(f"Skip (permission denied): {path}")
+        print(f"Skip (permission denied): {entry.path}")
         return False
     except OSError as e:
-        print(f"Skip ({e.__class__.__name__}): {path} -> {e}")
+        print(f"Skip ({e.__class__.__name__}): {entry.path} -> {e}")
         return False
+    return True
 
 
-def collect_targets(project_root: Path) -> list[Path]:
-    targets: list[Path] = []
+def list_files(directory: Path, suffix: str) -> list[os.DirEntry]:
+    """Return the regular files in directory ending with suffix, sorted by name.
 
-    scripts_dir = project_root / "scripts"
-    tools_dir = project_root / "tools"
+    os.scandir reports each entry's type along with its name, so filtering
+    needs no extra stat calls. A missing directory gives an empty list.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            files = [e for e in entries if e.name.endswith(suffix) and e.is_file()]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    return sorted(files, key=lambda e: e.name)
 
-    if scripts_dir.is_dir():
-        targets.extend(sorted(scripts_dir.glob("*.py")))
 
-    if tools_dir.is_dir():
-        targets.extend(sorted(tools_dir.glob("*.py")))
+def collect_targets(project_root: Path) -> list[os.DirEntry]:
+    targets = list_files(project_root / "scripts", ".py")
+    targets.extend(list_files(project_root / "tools", ".py"))
 
     # Shell scripts in repo root
-    targets.extend(sorted(project_root.glob("*.sh")))
-
-    # De-duplicate while preserving order
-    seen = set()
-    unique_targets = []
-    for t in targets:
-        if t not in seen:
-            unique_targets.append(t)
-            seen.add(t)
-    return unique_targets
+    targets.extend(list_files(project_root, ".sh"))
+    return targets
 
 
 def main() -> int:
-    project_root = Path(__file__).resolve().parent
+    project_root = Path(__file__).absolute().parent
 
     print("Setting executable permissions...")
     targets = collect_targets(project_root)
@@ -74,10 +81,10 @@ def main() -> int:
         return 0
 
     made = 0
-    for path in targets:
-        if make_executable(path):
+    for entry in targets:
+        if make_executable(entry):
             made += 1
-            print(f"+x set: {path.relative_to(project_root)}")
+            print(f"+x set: {os.path.relpath(entry.path, project_root)}")
 
     print(f"Done. Updated {made}/{len(targets)} files.")
     return 0
@@ -7,36 +7,74 @@ This script helps manage OpenAI API keys for the fine-tuning project.
 
 import os
 import argparse
+import copy
 import json
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 CONFIG_FILE = os.path.join(os.path.dirname(__file__), 'api_config.json')
 
+# Last parsed config plus the (mtime, size) of the file it was read from, so
+# repeated loads in one process skip re-reading an unchanged file
+_config_cache: Optional[Tuple[Tuple[int, int], Dict[str, Any]]] = None
+
+def _config_signature() -> Optional[Tuple[int, int]]:
+    """Return the config file's (mtime in ns, size), or None if it does not exist"""
+    try:
+        st = os.stat(CONFIG_FILE)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
 def load_config() -> Dict[str, Any]:
     """Load configuration from file if it exists
     
+    The parsed config is reused while the file's modification time and size
+    are unchanged. Each call returns its own copy, so changing the result
+    without saving it never affects later calls.
+    
     Returns:
         Dict[str, Any]: Configuration dictionary
     """
-    if os.path.exists(CONFIG_FILE):
-        try:
-            with open(CONFIG_FILE, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading config: {e}")
-    return {}
+    global _config_cache
+    signature = _config_signature()
+    if signature is None:
+        return {}
+    if _config_cache is not None and _config_cache[0] == signature:
+        return copy.deepcopy(_config_cache[1])
+    try:
+        with open(CONFIG_FILE, 'r') as f:
+            config = json.load(f)
+    except Exception as e:
+        print(f"Error loading config: {e}")
+        return {}
+    _config_cache = (signature, copy.deepcopy(config))
+    return config
 
 def save_config(config: Dict[str, Any]) -> None:
     """Save configuration to file
     
+    The new config is written to a temporary file and then renamed over the
+    old one, so an interrupted save never leaves a half-written file. The
+    file holds API keys, so it is created readable by its owner only (0600).
+    
     Args:
         config (Dict[str, Any]): Configuration dictionary
     """
+    global _config_cache
+    temp_file = f"{CONFIG_FILE}.{os.getpid()}.tmp"
     try:
-        with open(CONFIG_FILE, 'w') as f:
+        fd = os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
             json.dump(config, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())  # Make sure the data is on disk before the rename
+        os.replace(temp_file, CONFIG_FILE)  # Atomic: readers see the old file or the new one
+        _config_cache = (_config_signature(), copy.deepcopy(config))
     except Exception as e:
+        _config_cache = None  # Not sure what is on disk now
         print(f"Error saving config: {e}")
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
 
 def set_api_key(api_key: str, profile: str = "default") -> None:
     """Set OpenAI API key for a profile
@@ -47,13 +85,8 @@ def set_api_key(api_key: str, profile: str = "default") -> None:
     """
     config = load_config()
     
-    if "profiles" not in config:
-        config["profiles"] = {}
-        
-    config["profiles"][profile] = {"api_key": api_key}
-    
-    if "active_profile" not in config:
-        config["active_profile"] = profile
+    config.setdefault("profiles", {})[profile] = {"api_key": api_key}
+    config.setdefault("active_profile", profile)
         
     save_config(config)
     print(f"API key set for profile '{profile}'")
@@ -74,28 +107,27 @@ def get_api_key(profile: Optional[str] = None) -> Optional[str]:
     config = load_config()
     
     if not profile:
-        if "active_profile" in config:
-            profile = config["active_profile"]
-        else:
-            profile = "default"
+        profile = config.get("active_profile", "default")
             
-    if "profiles" in config and profile in config["profiles"]:
-        return config["profiles"][profile].get("api_key")
+    entry = config.get("profiles", {}).get(profile)
+    if entry is None:
+        return None
         
-    return None
+    return entry.get("api_key")
 
 def list_profiles() -> None:
     """List all profiles"""
     config = load_config()
     
-    if "profiles" not in config or not config["profiles"]:
+    profiles = config.get("profiles")
+    if not profiles:
         print("No profiles found")
         return
         
     active_profile = config.get("active_profile", "default")
     
     print("Profiles:")
-    for profile in config["profiles"]:
+    for profile in profiles:
         if profile == active_profile:
             print(f"* {profile} (active)")
         else:
@@ -109,7 +141,8 @@ def set_active_profile(profile: str) -> None:
     """
     config = load_config()
     
-    if "profiles" not in config or profile not in config["profiles"]:
+    entry = config.get("profiles", {}).get(profile)
+    if entry is None:
         print(f"Profile '{profile}' not found")
         return
         
@@ -117,7 +150,7 @@ def set_active_profile(profile: str) -> None:
     save_config(config)
     
     # Set environment variable for current session
-    api_key = config["profiles"][profile].get("api_key")
+    api_key = entry.get("api_key")
     if api_key:
         os.environ["OPENAI_API_KEY"] = api_key
         
@@ -132,17 +165,14 @@ def delete_profile(profile: str) -> None:
     """
     config = load_config()
     
-    if "profiles" not in config or profile not in config["profiles"]:
+    profiles = config.get("profiles", {})
+    if profiles.pop(profile, None) is None:
         print(f"Profile '{profile}' not found")
         return
-        
-    del config["profiles"][profile]
     
+    # Fall back to the first remaining profile, or "default" if none are left
     if config.get("active_profile") == profile:
-        if config["profiles"]:
-            config["active_profile"] = next(iter(config["profiles"]))
-        else:
-            config["active_profile"] = "default"
+        config["active_profile"] = next(iter(profiles), "default")
             
     save_config(config)
     print(f"Profile '{profile}' deleted")